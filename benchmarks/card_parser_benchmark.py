@@ -0,0 +1,83 @@
+"""
+Compares the throughput and the output of CardParser against the regex used before it.
+
+Run from the repository root:
+
+    python -m benchmarks.card_parser_benchmark [--iterations N] [fixture.html ...]
+"""
+import re
+import glob
+import argparse
+from html import unescape
+from time import perf_counter
+from card_parser import CardParser
+from http_search import ResultsPageParser
+
+FIXTURES_PATH = 'benchmarks/fixtures'
+
+LEGACY_PATTERN = re.compile(
+    r'(?:<img.*?src=\"(.*?)\".*?)?'
+    r'class="promo-title">\s+<a.*?>(.*?)<\/a>.*?'
+    r'class="promo-description".*?>(.*?)<\/p>.*?'
+    r'class=\"promo-timestamp\".*?data-timestamp=\"(.*?)\"', re.DOTALL)
+
+
+def parse_with_legacy_regex(html: str) -> list[tuple]:
+    """Parses the cards with the regex over innerHTML used before CardParser."""
+
+    return [match.groups() for match in LEGACY_PATTERN.finditer(html)]
+
+
+def parse_with_card_parser(html: str) -> list[tuple]:
+    """Parses the cards with CardParser."""
+
+    return [(card.image_url, card.title, card.description, card.timestamp) for card in CardParser.parse(html)]
+
+
+def normalize_legacy_card(card: tuple) -> tuple:
+    """Strips tags, entities and extra whitespace that the regex keeps in the card texts."""
+
+    image_url, title, description, timestamp = card
+
+    def to_text(value):
+        return ' '.join(unescape(re.sub(r'<[^>]+>', '', value)).split())
+
+    return (unescape(image_url) if image_url else None, to_text(title), to_text(description), timestamp)
+
+
+def measure(parse, html: str, iterations: int) -> float:
+    """Returns the number of pages parsed per second."""
+
+    start = perf_counter()
+    for _ in range(iterations):
+        parse(html)
+    return iterations / (perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('fixtures', nargs='*',
+                        default=sorted(glob.glob(f'{FIXTURES_PATH}/*.html')))
+    parser.add_argument('--iterations', type=int, default=500)
+    args = parser.parse_args()
+
+    for fixture in args.fixtures:
+        with open(fixture, encoding='utf-8') as file:
+            html = ResultsPageParser.parse(file.read()).results_html
+
+        legacy_cards = [normalize_legacy_card(card)
+                        for card in parse_with_legacy_regex(html)]
+        cards = parse_with_card_parser(html)
+        mismatches = sum(1 for legacy, card in zip(legacy_cards, cards) if legacy != card)
+        mismatches += abs(len(legacy_cards) - len(cards))
+
+        legacy_speed = measure(parse_with_legacy_regex, html, args.iterations)
+        parser_speed = measure(parse_with_card_parser, html, args.iterations)
+
+        print(f'{fixture}:')
+        print(f'  cards: regex={len(legacy_cards)} parser={len(cards)} mismatches={mismatches}')
+        print(f'  pages/s: regex={legacy_speed:.0f} parser={parser_speed:.0f}')
+
+
+if __name__ == '__main__':
+    main()
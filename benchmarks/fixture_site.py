@@ -0,0 +1,289 @@
+"""
+Local stand-in for the news website, serving the search flow used by NewsAutomation.
+
+Serves a home page with the search form, paginated search results with category filters,
+sort select, loading spinner and metering overlay, and the card images. Every page has its own
+news, and the images carry ETag and Last-Modified validators answered with 304 when they match,
+so the duplicate index and the image cache see the same traffic as on the real site. Page count,
+cards per page, latency and image size are configurable.
+
+Run from the repository root:
+
+    python -m benchmarks.fixture_site [--port 8000] [--pages 20] [--latency 0.05]
+"""
+import time
+import email.utils
+import random
+import argparse
+import threading
+from html import escape
+from urllib.parse import urlencode, urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+CATEGORIES = ['California', 'World & Nation', 'Politics', 'Business', 'Sports']
+
+WORDS = ('city council budget wildfire election housing transit water drought school vote '
+         'court ruling price market storm coast dollars governor freeway harbor').split()
+
+HOME_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>News fixture</title></head>
+<body>
+<header class="page-header">
+  <button data-element="search-button" onclick="document.getElementById('search').hidden = false">Search</button>
+  <form id="search" action="/search" method="get" hidden>
+    <input data-element="search-form-input" name="q" type="text">
+    <button data-element="search-submit-button" type="submit">Submit</button>
+  </form>
+</header>
+</body>
+</html>
+"""
+
+RESULTS_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>Search results</title>
+<style>
+  modality-custom-element {{ position: fixed; bottom: 0; left: 0; right: 0; height: 200px; background: #fff; }}
+  .search-filter-menu li.extra {{ display: none; }}
+  .search-filter-menu.expanded li.extra {{ display: block; }}
+</style></head>
+<body>
+<main>
+  <ps-search-results-module class="search-results-module">
+    <div class="search-results-module-filters">
+      <div class="search-filter">
+        <ul class="search-filter-menu">{labels}
+        </ul>
+        <span class="see-all-text" onclick="document.querySelector('.search-filter-menu').classList.add('expanded')">See All</span>
+      </div>
+    </div>
+    <div class="search-results-module-filters-selected" data-showing="{filter_showing}"></div>
+    <div class="search-results-module-sorts">
+      <select class="select-input" name="s" onchange="navigate({{s: this.value, p: 1}})">{sort_options}</select>
+    </div>
+    <div class="loading-icon" style="{spinner_style}"></div>
+    <ul class="search-results-module-results-menu">{cards}
+    </ul>
+    <div class="search-results-module-pagination">
+      <div class="search-results-module-page-counts">{page} of {total_pages}</div>
+      <div class="search-results-module-next-page"{next_inactive} onclick="{next_click}"><a>Next</a></div>
+    </div>
+  </ps-search-results-module>
+</main>
+<modality-custom-element name="metering-bottompanel"></modality-custom-element>
+<script>
+  const query = {query};
+  function navigate(changes) {{
+    const params = new URLSearchParams(Object.assign({{}}, query, changes));
+    for (const [key, value] of [...params.entries()]) {{ if (value === '') params.delete(key); }}
+    window.location.href = '/search?' + params.toString();
+  }}
+  document.querySelectorAll('.checkbox-input-element').forEach((input) => {{
+    input.addEventListener('change', () => navigate({{f0: input.checked ? input.value : '', p: 1}}));
+  }});
+  setTimeout(() => {{ const spinner = document.querySelector('.loading-icon'); if (spinner) spinner.style.display = 'none'; }}, {spinner_ms});
+</script>
+</body>
+</html>
+"""
+
+CARD = """
+      <li>
+        <ps-promo class="promo promo-position-large" data-content-type="article">
+          <div class="promo-wrapper">{media}
+            <div class="promo-content">
+              <div class="promo-title-container">
+                <h3 class="promo-title">
+                  <a class="link" href="/story/{index}">{title}</a>
+                </h3>
+              </div>
+              <p class="promo-description">{description}</p>
+              <p class="promo-timestamp" data-timestamp="{timestamp}">{index}</p>
+            </div>
+          </div>
+        </ps-promo>
+      </li>"""
+
+MEDIA = """
+            <div class="promo-media">
+              <a class="link promo-placeholder" href="/story/{index}" tabindex="-1">
+                <picture><img class="image" alt="" width="84" height="56" src="{base_url}/images/{index}.jpg"></picture>
+              </a>
+            </div>"""
+
+
+class FixtureSite:
+    """
+    Local HTTP server imitating the search flow of the news website.
+    """
+
+    def __init__(self, pages: int = 20, cards_per_page: int = 10, latency: float = 0.0, image_bytes: int = 20000,
+                 card_interval_hours: float = 6, spinner_ms: int = 300, port: int = 0):
+        """
+        Initializes the site content and the HTTP server.
+
+        Args:
+            pages (int, optional): Number of result pages of every search. Defaults to 20.
+            cards_per_page (int, optional): Number of news cards per page. Defaults to 10.
+            latency (float, optional): Delay (in seconds) added to every response. Defaults to 0.
+            image_bytes (int, optional): Size of every card image. Defaults to 20000.
+            card_interval_hours (float, optional): Time between the timestamps of consecutive cards. Defaults to 6.
+            spinner_ms (int, optional): Time the loading spinner stays visible on each results page. Defaults to 300.
+            port (int, optional): Port to listen on, 0 picks a free one. Defaults to 0.
+        """
+        self.pages = pages
+        self.cards_per_page = cards_per_page
+        self.latency = latency
+        self.card_interval_ms = int(card_interval_hours * 3600 * 1000)
+        self.spinner_ms = spinner_ms
+        self.newest_timestamp = int(time.time() * 1000)
+        self.image = bytes(random.Random(0).getrandbits(8) for _ in range(image_bytes))
+        self.image_last_modified = email.utils.formatdate(time.time(), usegmt=True)
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), self.create_handler())
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        """
+        Base URL of the site.
+        """
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        """
+        Starts serving requests in a background thread.
+        """
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stops the server.
+        """
+        self.server.shutdown()
+        self.server.server_close()
+
+    def render_results(self, query: dict) -> str:
+        """
+        Render a search results page.
+
+        Args:
+            query (dict): Query parameters of the request.
+
+        Returns:
+            str: HTML of the page.
+        """
+        page = max(1, int(query.get('p', '1') or 1))
+        phrase = query.get('q', '')
+        category = query.get('f0', '')
+        rng = random.Random(f'{phrase}|{category}|{page}')
+
+        labels = ''.join(
+            f'\n          <li class="checkbox-input{" extra" if number > 1 else ""}"><label class="checkbox-input-label">'
+            f'<input class="checkbox-input-element" type="checkbox" name="f0" value="category-{number}"'
+            f'{" checked" if category == f"category-{number}" else ""}><span>{escape(name)}</span></label></li>'
+            for number, name in enumerate(CATEGORIES))
+
+        sort_options = ''.join(
+            f'<option value="{value}"{" selected" if query.get("s", "0") == value else ""}>{label}</option>'
+            for value, label in (('0', 'Relevance'), ('1', 'Newest'), ('2', 'Oldest')))
+
+        cards = []
+        for position in range(self.cards_per_page):
+            index = (page - 1) * self.cards_per_page + position
+            title = ' '.join(rng.choice(WORDS) for _ in range(7)).capitalize()
+            if index % 7 == 3:
+                title = f'{phrase} {title}'
+            description = ' '.join(rng.choice(WORDS) for _ in range(24)).capitalize() + '.'
+            media = '' if index % 9 == 4 else MEDIA.format(index=index, base_url=self.url)
+            cards.append(CARD.format(index=index, media=media, title=escape(title), description=escape(description),
+                                     timestamp=self.newest_timestamp - index * self.card_interval_ms))
+
+        is_last_page = page >= self.pages
+        next_query = urlencode({**query, 'p': page + 1})
+
+        return RESULTS_PAGE.format(
+            labels=labels,
+            filter_showing='true' if category else 'false',
+            sort_options=sort_options,
+            spinner_style='display: block',
+            spinner_ms=self.spinner_ms,
+            cards=''.join(cards),
+            page=page,
+            total_pages=f'{self.pages:,}',
+            next_inactive=' data-inactive' if is_last_page else '',
+            next_click='' if is_last_page else f"window.location.href = '/search?{next_query}'",
+            query=repr({key: value for key, value in query.items()}).replace("'", '"'))
+
+    def create_handler(self):
+        """
+        Create the request handler class bound to this site.
+
+        Returns:
+            type: Handler class for the HTTP server.
+        """
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                if site.latency:
+                    time.sleep(site.latency)
+
+                url = urlparse(self.path)
+                query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+                if url.path == '/':
+                    self.respond('text/html; charset=utf-8', HOME_PAGE.encode())
+                elif url.path == '/search':
+                    self.respond('text/html; charset=utf-8', site.render_results(query).encode())
+                elif url.path.startswith('/images/'):
+                    validators = {'ETag': f'"{url.path.rsplit("/", 1)[-1]}-{len(site.image)}"',
+                                  'Last-Modified': site.image_last_modified}
+
+                    if self.headers.get('If-None-Match') == validators['ETag']:
+                        self.send_response(304)
+                        self.send_header('ETag', validators['ETag'])
+                        self.end_headers()
+                    else:
+                        self.respond('image/jpeg', site.image, validators)
+                else:
+                    self.send_error(404)
+
+            def respond(self, content_type: str, body: bytes, headers: dict | None = None):
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--cards-per-page', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--image-bytes', type=int, default=20000)
+    args = parser.parse_args()
+
+    site = FixtureSite(args.pages, args.cards_per_page, args.latency, args.image_bytes, port=args.port)
+    print(f'Serving the fixture site at {site.url}')
+
+    try:
+        site.server.serve_forever()
+    except KeyboardInterrupt:
+        site.stop()
+
+
+if __name__ == '__main__':
+    main()
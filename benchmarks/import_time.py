@@ -0,0 +1,65 @@
+"""
+Profiles the cold start of the consumer task with `python -X importtime`.
+
+Imports the given module (the consumer task by default) in a fresh interpreter and prints the
+total import time and the slowest top-level imports. Optionally constructs a NewsAutomation too,
+to check that the heavy libraries are not loaded until they are used.
+
+Run from the repository root:
+
+    python -m benchmarks.import_time [--module consumer] [--construct] [--top 15]
+"""
+import sys
+import argparse
+import subprocess
+
+HEAVY_MODULES = ['RPA.Browser.Selenium', 'RPA.Excel.Files', 'selenium', 'openpyxl', 'requests', 'PIL']
+
+
+def profile_imports(code: str) -> tuple[list[tuple[int, int, str]], list[str]]:
+    """Runs code in a fresh interpreter, returning its import times and the heavy modules it loaded."""
+
+    check = f'import sys; print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))'
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'{code}\n{check}'],
+                            capture_output=True, text=True, check=True)
+
+    imports = []
+
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        self_time, cumulative, module = line[len('import time:'):].split('|')
+        imports.append((int(self_time), int(cumulative), module.rstrip()))
+
+    loaded = [module for module in result.stdout.strip().split(',') if module]
+
+    return imports, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--module', default='consumer')
+    parser.add_argument('--construct', action='store_true',
+                        help='also construct a NewsAutomation after importing')
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    code = f'import {args.module}'
+    if args.construct:
+        code += '\nfrom news_automation import NewsAutomation\nNewsAutomation()'
+
+    imports, loaded = profile_imports(code)
+
+    top_level = [entry for entry in imports if not entry[2].startswith(' ' * 3)]
+    total = sum(cumulative for _, cumulative, _ in top_level)
+
+    print(f'{args.module}: {total / 1000:.1f} ms importing {len(imports)} modules')
+    print(f'heavy modules loaded: {", ".join(loaded) or "none"}')
+
+    for _, cumulative, module in sorted(top_level, reverse=True, key=lambda entry: entry[1])[:args.top]:
+        print(f'  {cumulative / 1000:8.1f} ms  {module.strip()}')
+
+
+if __name__ == '__main__':
+    main()
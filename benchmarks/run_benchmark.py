@@ -0,0 +1,124 @@
+"""
+Runs work items end to end against the local fixture site and reports throughput, page latency and memory.
+
+The automation runs in a temporary working directory, so the temp, output and cache folders
+of the repository are left untouched. The output folder is emptied after every item to keep
+its quota from failing long runs.
+
+Run from the repository root:
+
+    python -m benchmarks.run_benchmark [--backend http|selenium] [--browser-profile desktop|scraping] [--items 5] [--pages 20] [--latency 0.05]
+"""
+import os
+import sys
+import time
+import argparse
+import resource
+import tempfile
+import tracemalloc
+from statistics import quantiles
+from benchmarks.fixture_site import FixtureSite
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class BenchmarkItem:
+    """
+    Work item stand-in holding a payload and the state it was released with.
+    """
+
+    def __init__(self, payload: dict):
+        self.payload = payload
+        self.state = None
+        self.message = None
+
+    def done(self):
+        self.state = 'DONE'
+
+    def fail(self, exception_type: str = 'APPLICATION', code: str | None = None, message: str | None = None):
+        self.state = exception_type
+        self.message = message
+
+
+def get_percentiles(values: list[float]) -> dict:
+    """Returns the p50, p90 and p99 of a list of durations, in milliseconds."""
+
+    if len(values) < 2:
+        values = values * 2 or [0.0, 0.0]
+
+    points = quantiles(values, n=100, method='inclusive')
+    return {f'p{point}': points[point - 1] * 1000 for point in (50, 90, 99)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--backend', choices=['http', 'selenium'], default='http')
+    parser.add_argument('--browser-profile', choices=['desktop', 'scraping'], default='scraping')
+    parser.add_argument('--items', type=int, default=5)
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--cards-per-page', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--image-bytes', type=int, default=20000)
+    parser.add_argument('--months', type=int, default=2)
+    parser.add_argument('--category', default='')
+    args = parser.parse_args()
+
+    site = FixtureSite(args.pages, args.cards_per_page, args.latency, args.image_bytes)
+    site.start()
+
+    # config reads the environment on import, so it must be set before importing the automation
+    os.environ['NEWS_WEBSITE_URL'] = site.url
+    os.environ['NEWS_SEARCH_BACKEND'] = args.backend
+    os.environ['NEWS_BROWSER_PROFILE'] = args.browser_profile
+    os.environ['NEWS_METRICS'] = 'true'
+
+    sys.path.insert(0, ROOT_PATH)
+    os.chdir(tempfile.mkdtemp(prefix='news-benchmark-'))
+
+    tracemalloc.start()
+
+    from consumer import process_work_item
+    from news_automation import NewsAutomation
+
+    automation = NewsAutomation()
+    items = [BenchmarkItem({'news_data': {'search_phrase': f'benchmark {number}',
+                                          'news_category': args.category,
+                                          'number_of_months': args.months}})
+             for number in range(args.items)]
+
+    page_durations = []
+    start = time.perf_counter()
+
+    try:
+        for item in items:
+            process_work_item(automation, item)
+            page_durations += [span['duration'] for span in automation.metrics.spans
+                               if span['name'] == 'page']
+            automation.files.delete_files_from_folder(automation.output_path)
+    finally:
+        automation.close()
+        site.stop()
+
+    elapsed = time.perf_counter() - start
+    _, peak_traced = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    states = [item.state for item in items]
+    percentiles = get_percentiles(page_durations)
+
+    print(f'backend: {args.backend}, site: {args.pages} pages x {args.cards_per_page} cards, latency {args.latency}s')
+    print(f'items: {states.count("DONE")} done, {len(states) - states.count("DONE")} failed in {elapsed:.2f}s')
+    print(f'throughput: {len(items) / elapsed * 60:.1f} items/minute')
+    print(f'pages: {len(page_durations)}, latency ms ' +
+          ' '.join(f'{name}={value:.1f}' for name, value in percentiles.items()))
+    print(f'memory: python peak {peak_traced / 1024 ** 2:.1f} MB, '
+          f'process max RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB, '
+          f'children max RSS {resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024:.1f} MB')
+
+    for item in items:
+        if item.state != 'DONE':
+            print(f'  {item.payload["news_data"]["search_phrase"]}: {item.state} {item.message}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,92 @@
 import re
+import json
+import time
 from RPA.Browser.Selenium import Selenium
 from typing import Match, Iterator, Any
+from selenium.webdriver import ChromeOptions
+from selenium.common.exceptions import JavascriptException, StaleElementReferenceException, TimeoutException
+
+# File extensions blocked for each resource type by the scraping profile.
+RESOURCE_EXTENSIONS = {
+    'image': ['jpg', 'jpeg', 'png', 'gif', 'webp', 'avif', 'svg', 'ico'],
+    'media': ['mp4', 'webm', 'm3u8', 'ts', 'mp3', 'aac'],
+    'font': ['woff', 'woff2', 'ttf', 'otf', 'eot'],
+    'stylesheet': ['css'],
+    'script': ['js'],
+}
+
+SEARCH_RESULTS_SCRIPT = """
+    const [listSelector, pageCountsSelector, nextPageSelector, timeout, done] = arguments;
+    const text = (element) => element ? element.textContent.replace(/\\s+/g, ' ').trim() : null;
+    const started = Date.now();
+
+    const read = () => {
+        const list = document.querySelector(listSelector);
+
+        if ((!list || !list.offsetParent) && Date.now() - started < timeout) {
+            setTimeout(read, 50);
+            return;
+        }
+
+        const cards = list ? Array.from(list.children).filter((item) => item.tagName === 'LI').map((item) => {
+            const image = item.querySelector('img');
+            const timestamp = item.querySelector('.promo-timestamp');
+            return {
+                image_url: image ? image.getAttribute('src') : null,
+                title: text(item.querySelector('.promo-title a')),
+                description: text(item.querySelector('.promo-description')) || '',
+                timestamp: timestamp ? timestamp.getAttribute('data-timestamp') : null,
+            };
+        }).filter((card) => card.title !== null && card.timestamp) : [];
+
+        const counts = text(document.querySelector(pageCountsSelector));
+        const match = counts ? counts.match(/of\\s([\\d.,]+)/) : null;
+        const nextPage = document.querySelector(nextPageSelector);
+
+        done(JSON.stringify({
+            list_found: list !== null && list.offsetParent !== null,
+            cards: cards,
+            total_pages: match ? parseInt(match[1].replace(/[.,]/g, ''), 10) : null,
+            next_page_exists: nextPage !== null,
+            next_page_inactive: nextPage !== null && nextPage.hasAttribute('data-inactive'),
+        }));
+    };
+
+    read();
+"""
+
+DOM_SETTLED_SCRIPT = """
+    const [quietPeriod, timeout, busySelector, rootSelector, done] = arguments;
+    const started = Date.now();
+    let lastMutation = Date.now();
+
+    // Only elements added or removed count, animations and counters elsewhere in the page do not.
+    const root = (rootSelector && document.querySelector(rootSelector)) || document.documentElement;
+    const observer = new MutationObserver(() => { lastMutation = Date.now(); });
+    observer.observe(root, { childList: true, subtree: true });
+
+    const isBusy = () => {
+        if (document.readyState !== 'complete') {
+            return true;
+        }
+        const busy = busySelector ? document.querySelector(busySelector) : null;
+        return busy !== null && busy.offsetParent !== null;
+    };
+
+    const check = () => {
+        const now = Date.now();
+
+        if ((!isBusy() && now - lastMutation >= quietPeriod) || now - started >= timeout) {
+            observer.disconnect();
+            done(!isBusy() && now - lastMutation >= quietPeriod);
+            return;
+        }
+
+        setTimeout(check, Math.min(quietPeriod, 50));
+    };
+
+    check();
+"""
 
 
 class BrowserUtils(Selenium):
@@ -15,6 +101,49 @@ class BrowserUtils(Selenium):
         Initializes BrowserUtils by invoking the constructor of the base class Selenium.
         """
         super().__init__()
+        self.command_count = 0
+
+    def open_scraping_browser(self, url: str, blocked_resources: list[str], blocked_domains: list[str], window_size: tuple[int, int] = (1280, 800)):
+        """
+        Opens a headless Chrome tuned for scraping, which only loads what is needed to read the pages.
+
+        Images are disabled, the window has a fixed size and requests for the given resource types and
+        domains are blocked through the DevTools protocol. The blocks are applied on a blank page before
+        navigating, so the first page load is already filtered.
+
+        Args:
+            url (str): URL to open.
+            blocked_resources (list[str]): Resource types to block, among the keys of RESOURCE_EXTENSIONS.
+            blocked_domains (list[str]): Domains whose requests are blocked, such as ad and tracking servers.
+            window_size (tuple[int, int], optional): Width and height of the window. Defaults to (1280, 800).
+
+        Returns:
+            None
+        """
+        options = ChromeOptions()
+        options.add_argument(f'--window-size={window_size[0]},{window_size[1]}')
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_argument('--mute-audio')
+        options.add_experimental_option(
+            'prefs', {'profile.managed_default_content_settings.images': 2})
+
+        self.open_available_browser(
+            'about:blank', headless=True, browser_selection='chrome', options=options)
+
+        # Blocked URL patterns only support "*", so URLs with and without a query string are matched
+        # separately. A plain "*.js*" pattern would also block the ".json" requests of the page.
+        patterns = [pattern for resource in blocked_resources
+                    for extension in RESOURCE_EXTENSIONS.get(resource, [])
+                    for pattern in (f'*.{extension}', f'*.{extension}?*')]
+        patterns += [f'*://*.{domain}/*' for domain in blocked_domains]
+        patterns += [f'*://{domain}/*' for domain in blocked_domains]
+
+        if patterns:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd(
+                'Network.setBlockedURLs', {'urls': patterns})
+
+        self.go_to(url)
 
     def click_element_if_possible(self, locator: str) -> bool:
         """
@@ -36,27 +165,6 @@ class BrowserUtils(Selenium):
 
         return True
 
-    def wait_for_loading(self, locator: str, timeout: int):
-        """
-        Wait for loading spinner to disappear after an element becomes visible.
-
-        This method waits until the loading spinner disappears after an element 
-        located by the provided locator becomes visible, within the specified timeout.
-
-        Args:
-            locator (str): Locator for the element.
-            timeout (int): Maximum time (in seconds) to wait for the loading spinner appear for the first time.
-
-        Returns:
-            None
-        """
-        try:
-            self.wait_until_element_is_visible(
-                locator, timeout=timeout)
-            self.wait_until_element_is_not_visible(locator)
-        except:
-            pass
-
     def input_text_when_visible(self, locator: str, text: str):
         """
         Input text into the specified element when it becomes visible.
@@ -189,3 +297,105 @@ class BrowserUtils(Selenium):
             return True
         except:
             return False
+
+    def reset_session(self, url: str):
+        """
+        Resets the state of the current browser so it can be reused for a new session.
+
+        Deletes all cookies, navigates to the given URL and clears the web storage of its origin,
+        which discards any search, filter or sorting state left by the previous session.
+
+        Args:
+            url (str): URL to navigate to after the cookies are deleted.
+
+        Returns:
+            None
+        """
+        self.delete_all_cookies()
+        self.go_to(url)
+        self.execute_javascript(
+            "window.localStorage.clear(); window.sessionStorage.clear();")
+
+    def get_search_results_page(self, list_locator: str, page_counts_locator: str, next_page_locator: str, timeout: float = 4) -> dict:
+        """
+        Reads the cards and the pagination state of a search results page in a single WebDriver call.
+
+        Runs one script in the page that waits until the results list is visible, then collects the
+        image URL, title, description and timestamp of every card, the total number of pages and the
+        state of the next page button. A list that never became visible is reported, not raised.
+
+        Args:
+            list_locator (str): CSS selector of the search results list.
+            page_counts_locator (str): CSS selector of the element with the page counts ("1 of N").
+            next_page_locator (str): CSS selector of the next page button.
+            timeout (float, optional): Maximum time (in seconds) to wait for the results list. Defaults to 4.
+
+        Returns:
+            dict: Dictionary with the keys 'list_found' (bool), 'cards' (list of dicts), 'total_pages' (int | None),
+                'next_page_exists' (bool) and 'next_page_inactive' (bool).
+        """
+        result = self.driver.execute_async_script(
+            SEARCH_RESULTS_SCRIPT, list_locator, page_counts_locator, next_page_locator, timeout * 1000)
+
+        return json.loads(result)
+
+    def wait_until_dom_settles(self, busy_selector: str | None = None, root_selector: str | None = None,
+                               quiet_period: float = 0.3, timeout: float = 10) -> bool:
+        """
+        Wait until the page stops changing, returning as soon as it does.
+
+        Observes the elements added to or removed from the page, or from the given root element only,
+        with a MutationObserver and returns once the document is loaded, no mutation happened during
+        the quiet period and the optional busy indicator is not visible. If the page navigates away
+        while waiting, the wait starts over on the new document. Any other WebDriver error is raised.
+
+        Args:
+            busy_selector (str | None, optional): CSS selector of an element, such as a loading spinner, that
+                must not be visible. Defaults to None.
+            root_selector (str | None, optional): CSS selector of the element whose subtree is observed.
+                Defaults to None, which observes the whole document.
+            quiet_period (float, optional): Time (in seconds) without mutations to consider the page settled. Defaults to 0.3.
+            timeout (float, optional): Maximum time (in seconds) to wait. Defaults to 10.
+
+        Returns:
+            bool: True if the page settled, False if the timeout was reached first.
+        """
+        deadline = time.monotonic() + timeout
+
+        while True:
+            remaining = deadline - time.monotonic()
+
+            if remaining <= 0:
+                return False
+
+            self.driver.set_script_timeout(remaining + 1)
+
+            try:
+                return self.driver.execute_async_script(
+                    DOM_SETTLED_SCRIPT, quiet_period * 1000, remaining * 1000, busy_selector, root_selector)
+            except (JavascriptException, StaleElementReferenceException, TimeoutException):
+                # The document was replaced by a navigation while the script was running.
+                time.sleep(0.05)
+            finally:
+                self.driver.set_script_timeout(self.timeout)
+
+    def enable_command_counting(self):
+        """
+        Counts every WebDriver command sent by the current browser in `command_count`.
+
+        Returns:
+            None
+        """
+        driver = self.driver
+
+        if getattr(driver, 'is_counting_commands', False):
+            return
+
+        execute = driver.execute
+
+        def counted_execute(*args, **kwargs):
+            self.command_count += 1
+            return execute(*args, **kwargs)
+
+        driver.execute = counted_execute
+        driver.is_counting_commands = True
@@ -0,0 +1,164 @@
+from dataclasses import dataclass
+from html.parser import HTMLParser
+
+
+@dataclass(frozen=True)
+class NewsCard:
+    """
+    News card found in a search results page.
+    """
+
+    image_url: str | None
+    title: str
+    description: str
+    timestamp: str
+
+
+class CardParser(HTMLParser):
+    """
+    Parses the news cards of a search results page with an HTML parser.
+
+    Each item of the results list is a card. The fields of a card are located by the
+    selectors below, which are matched against the tag and the class list of each element.
+    """
+
+    card_selector = ('li', None)
+    title_selector = (None, 'promo-title')
+    title_link_selector = ('a', None)
+    description_selector = (None, 'promo-description')
+    timestamp_selector = (None, 'promo-timestamp')
+
+    def __init__(self):
+        """
+        Initializes the parser state.
+        """
+        super().__init__(convert_charrefs=True)
+        self.cards = []
+        self.card = None
+        self.card_depth = 0
+        self.title_tag = None
+        self.title_depth = 0
+        self.capture = None
+        self.capture_tag = None
+        self.capture_depth = 0
+        self.text = []
+
+    @classmethod
+    def parse(cls, html: str) -> list[NewsCard]:
+        """
+        Parse the news cards found in the HTML of the search results list.
+
+        Args:
+            html (str): HTML of the search results list.
+
+        Returns:
+            list[NewsCard]: The cards found, in page order.
+        """
+        parser = cls()
+        parser.feed(html)
+        parser.close()
+        return parser.cards
+
+    def matches(selector: tuple[str | None, str | None], tag: str, classes: list[str]) -> bool:
+        """
+        Check whether an element matches a (tag, class) selector.
+
+        Args:
+            selector (tuple[str | None, str | None]): Tag and class of the selector, None matches anything.
+            tag (str): Tag of the element.
+            classes (list[str]): Class list of the element.
+
+        Returns:
+            bool: True if the element matches the selector, False otherwise.
+        """
+        selector_tag, selector_class = selector
+        return (selector_tag is None or selector_tag == tag) and (selector_class is None or selector_class in classes)
+
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+        classes = (attributes.get('class') or '').split()
+
+        if CardParser.matches(self.card_selector, tag, classes):
+            if self.card is None:
+                self.card = {'image_url': None, 'title': None,
+                             'description': '', 'timestamp': None}
+            self.card_depth += 1
+            return
+
+        if self.card is None:
+            return
+
+        if self.capture:
+            if tag == self.capture_tag:
+                self.capture_depth += 1
+            return
+
+        if self.title_tag == tag:
+            self.title_depth += 1
+
+        if tag == 'img' and self.card['image_url'] is None:
+            self.card['image_url'] = attributes.get('src')
+
+        elif self.title_tag and CardParser.matches(self.title_link_selector, tag, classes):
+            self.start_capture('title', tag)
+
+        elif CardParser.matches(self.title_selector, tag, classes):
+            self.title_tag = tag
+            self.title_depth = 1
+
+        elif CardParser.matches(self.description_selector, tag, classes):
+            self.start_capture('description', tag)
+
+        elif CardParser.matches(self.timestamp_selector, tag, classes):
+            self.card['timestamp'] = attributes.get('data-timestamp')
+
+    def handle_endtag(self, tag):
+        if self.card is None:
+            return
+
+        if self.capture:
+            if tag == self.capture_tag:
+                self.capture_depth -= 1
+                if self.capture_depth == 0:
+                    self.card[self.capture] = ' '.join(
+                        ''.join(self.text).split())
+                    self.capture = None
+            return
+
+        if self.title_tag == tag:
+            self.title_depth -= 1
+            if self.title_depth == 0:
+                self.title_tag = None
+
+        if CardParser.matches(self.card_selector, tag, []):
+            self.card_depth -= 1
+            if self.card_depth == 0:
+                self.finish_card()
+
+    def handle_data(self, data):
+        if self.capture:
+            self.text.append(data)
+
+    def start_capture(self, field: str, tag: str):
+        """
+        Starts collecting the text of an element into a card field.
+
+        Args:
+            field (str): Name of the card field.
+            tag (str): Tag of the element whose text is collected.
+        """
+        self.capture = field
+        self.capture_tag = tag
+        self.capture_depth = 1
+        self.text = []
+
+    def finish_card(self):
+        """
+        Adds the current card to the results if it has the required fields.
+        """
+        if self.card['title'] is not None and self.card['timestamp'] is not None:
+            self.cards.append(NewsCard(**self.card))
+
+        self.card = None
+        self.title_tag = None
+        self.title_depth = 0
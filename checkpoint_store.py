@@ -0,0 +1,140 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+from typing import Iterator
+
+
+class CheckpointStore:
+    """
+    Stores the progress of the work items on disk, so a retried item resumes where it failed.
+
+    Each checkpoint is a JSON Lines file named after a hash of the work item payload, with one
+    line per completed page holding the page number and the news accepted in it. Pages are
+    appended as they complete, so saving a page costs the same no matter how many came before.
+    Checkpoints older than the maximum age are ignored, since the result pages drift as news
+    are published. The finished images of the accepted news are kept in a folder next to the
+    checkpoint, so a resumed item does not download them again.
+    """
+
+    def __init__(self, path: str, max_age_hours: float):
+        """
+        Initializes the store, creating its folder.
+
+        Args:
+            path (str): Folder where the checkpoints are stored.
+            max_age_hours (float): Maximum age of a checkpoint to be resumed, in hours.
+        """
+        self.path = path
+        self.max_age_seconds = max_age_hours * 3600
+
+        os.makedirs(path, exist_ok=True)
+
+    def get_key(payload: dict) -> str:
+        """
+        Build the checkpoint key of a work item payload.
+
+        Args:
+            payload (dict): Payload of the work item.
+
+        Returns:
+            str: Hexadecimal hash of the payload.
+        """
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def load(self, key: str) -> Iterator[dict]:
+        """
+        Read the pages of a checkpoint, if there is a recent one.
+
+        A last line left incomplete by a crash is ignored.
+
+        Args:
+            key (str): Key of the checkpoint.
+
+        Returns:
+            Iterator[dict]: Completed pages in order, each with the keys 'page' (int) and 'cards' (list of dicts).
+        """
+        checkpoint_path = os.path.join(self.path, f'{key}.jsonl')
+
+        try:
+            if time.time() - os.path.getmtime(checkpoint_path) > self.max_age_seconds:
+                self.delete(key)
+                return
+
+            with open(checkpoint_path, encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        return
+        except OSError:
+            return
+
+    def append(self, key: str, page: int, cards: list[dict]):
+        """
+        Add a completed page to a checkpoint.
+
+        Args:
+            key (str): Key of the checkpoint.
+            page (int): Number of the completed page.
+            cards (list[dict]): Cards of the news accepted in the page.
+        """
+        with open(os.path.join(self.path, f'{key}.jsonl'), 'a', encoding='utf-8') as file:
+            file.write(json.dumps({'page': page, 'cards': cards}) + '\n')
+
+    def load_image(self, key: str, url: str) -> bytes | None:
+        """
+        Read an image stored with a checkpoint.
+
+        Args:
+            key (str): Key of the checkpoint.
+            url (str): URL of the image.
+
+        Returns:
+            (bytes | None): Content of the image, or None if it is not stored.
+        """
+        try:
+            with open(os.path.join(self.path, key, hashlib.sha256(url.encode('utf-8')).hexdigest()), 'rb') as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def save_image(self, key: str, url: str, image: bytes):
+        """
+        Store the finished image of an accepted news with a checkpoint.
+
+        The image is written to a temporary file first, so a crash never leaves a truncated one.
+
+        Args:
+            key (str): Key of the checkpoint.
+            url (str): URL of the image.
+            image (bytes): Content of the image.
+        """
+        images_path = os.path.join(self.path, key)
+        os.makedirs(images_path, exist_ok=True)
+
+        descriptor, temp_path = tempfile.mkstemp(dir=images_path, suffix='.tmp')
+
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(image)
+            os.replace(temp_path, os.path.join(images_path, hashlib.sha256(url.encode('utf-8')).hexdigest()))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def delete(self, key: str):
+        """
+        Delete a checkpoint and its images, if they exist.
+
+        Args:
+            key (str): Key of the checkpoint.
+        """
+        try:
+            os.remove(os.path.join(self.path, f'{key}.jsonl'))
+        except FileNotFoundError:
+            pass
+
+        shutil.rmtree(os.path.join(self.path, key), ignore_errors=True)
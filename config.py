@@ -0,0 +1,117 @@
+import os
+import importlib.util
+
+# Number of threads of the enrichment stage, which analyzes the text and downloads the image of
+# the accepted news of a work item. NEWS_DOWNLOAD_WORKERS is still read for compatibility.
+ENRICHMENT_WORKERS = int(os.getenv('NEWS_ENRICHMENT_WORKERS', os.getenv('NEWS_DOWNLOAD_WORKERS', 8)))
+
+# Keeps the browser open between work items instead of starting a new one for each item.
+REUSE_BROWSER = os.getenv('NEWS_REUSE_BROWSER', 'true').lower() == 'true'
+
+# Number of work items processed by the same browser before it is restarted.
+BROWSER_RECYCLE_ITEMS = int(os.getenv('NEWS_BROWSER_RECYCLE_ITEMS', 25))
+
+# Browser profile: 'desktop' opens a regular maximized browser, 'scraping' opens a headless Chrome
+# with images disabled, a small window and the resources below blocked.
+BROWSER_PROFILE = os.getenv('NEWS_BROWSER_PROFILE', 'desktop').lower()
+
+# Resource types blocked by the scraping profile (image, media, font, stylesheet, script).
+BROWSER_BLOCKED_RESOURCES = [resource.strip() for resource in os.getenv(
+    'NEWS_BROWSER_BLOCKED_RESOURCES', 'image,media,font').split(',') if resource.strip()]
+
+# Third-party domains blocked by the scraping profile, usually ad and tracking servers.
+BROWSER_BLOCKED_DOMAINS = [domain.strip() for domain in os.getenv(
+    'NEWS_BROWSER_BLOCKED_DOMAINS',
+    'doubleclick.net,googlesyndication.com,googletagservices.com,googletagmanager.com,'
+    'google-analytics.com,amazon-adsystem.com,adnxs.com,taboola.com,outbrain.com,'
+    'scorecardresearch.com,chartbeat.com,chartbeat.net,facebook.net,krxd.net,'
+    'moatads.com,pubmatic.com,rubiconproject.com,casalemedia.com').split(',') if domain.strip()]
+
+# Number of work items processed at the same time, each one by a worker with its own browser.
+WORKERS = int(os.getenv('NEWS_WORKERS', 1))
+
+# Lets the worker pool and coalescing reserve several work items in one Control Room step run, which
+# goes beyond the one reserved item per run that Control Room documents. Parallel step runs are the
+# supported alternative. Local runs do not need it.
+ALLOW_CONCURRENT_RESERVATIONS = os.getenv('NEWS_ALLOW_CONCURRENT_RESERVATIONS', 'false').lower() == 'true'
+
+# Base URL of the news website. Can point to a local stand-in server serving fixture pages.
+WEBSITE_URL = os.getenv('NEWS_WEBSITE_URL', 'https://www.latimes.com')
+
+# Reserves every pending work item up front and crawls once for all the items with the same search
+# phrase and news category, using the widest date window and splitting the results per item.
+COALESCE_ITEMS = os.getenv('NEWS_COALESCE_ITEMS', 'false').lower() == 'true'
+
+# Backend used to read the search results: 'http' fetches the result pages directly and
+# falls back to the browser on failure, 'selenium' always drives the browser.
+SEARCH_BACKEND = os.getenv('NEWS_SEARCH_BACKEND', 'http').lower()
+
+# Counts the search phrase in the news only when it is not part of a longer word.
+MATCH_WHOLE_WORDS = os.getenv('NEWS_MATCH_WHOLE_WORDS', 'false').lower() == 'true'
+
+# Number of extracted news kept in memory by each worker before they are spilled to the temp folder.
+# 0 keeps every news in memory.
+STORE_MAX_ROWS_IN_MEMORY = int(os.getenv('NEWS_STORE_MAX_ROWS_IN_MEMORY', 1000))
+
+# Folder for data kept between runs. It lives outside the output folder so it does not count
+# towards the artifact limits.
+CACHE_PATH = os.getenv('NEWS_CACHE_PATH', 'cache')
+
+# Remembers the extracted news of each search phrase so re-runs skip already seen articles.
+PERSIST_SEEN_NEWS = os.getenv('NEWS_PERSIST_SEEN', 'false').lower() == 'true'
+
+# Crawls each (search phrase, news category) pair only until the newest news of its previous run
+# and merges the new news into the previous result set.
+INCREMENTAL_CRAWL = os.getenv('NEWS_INCREMENTAL', 'false').lower() == 'true'
+
+# Maximum age, in hours, of the page checkpoints a retried work item resumes from. 0 disables checkpoints.
+CHECKPOINT_MAX_AGE_HOURS = float(os.getenv('NEWS_CHECKPOINT_MAX_AGE_HOURS', 24))
+
+# Maximum number of result pages fetched at the same time by the HTTP search backend.
+PAGE_FETCH_CONCURRENCY = int(os.getenv('NEWS_PAGE_FETCH_CONCURRENCY', 4))
+
+# Maximum number of accepted news waiting in each stage of the pipeline: enrichment (text analysis and
+# image download) and output files. Extraction pauses when it is reached, which bounds the downloads in flight.
+PIPELINE_QUEUE_SIZE = int(os.getenv('NEWS_PIPELINE_QUEUE_SIZE', 64))
+
+# Formats of the result files added to the ZIP file, among xlsx, jsonl, csv and parquet (requires pyarrow).
+# Checked here, so a wrong value stops the run before any work item is reserved.
+OUTPUT_FORMATS = [output_format.strip().lower() for output_format in os.getenv(
+    'NEWS_OUTPUT_FORMATS', 'xlsx').split(',') if output_format.strip()]
+
+for output_format in OUTPUT_FORMATS:
+    if output_format not in ('xlsx', 'jsonl', 'csv', 'parquet'):
+        raise ValueError(
+            f'Unknown output format "{output_format}" in NEWS_OUTPUT_FORMATS.')
+
+if 'parquet' in OUTPUT_FORMATS and importlib.util.find_spec('pyarrow') is None:
+    raise ImportError('The parquet output format requires the pyarrow package.')
+
+# What happens when an image does not fit in the output size budget: 'fail' stops the work item
+# right away, 'degrade' leaves the image out of the ZIP file and keeps extracting.
+OUTPUT_BUDGET_POLICY = os.getenv('NEWS_OUTPUT_BUDGET_POLICY', 'fail').lower()
+
+# Maximum size of the on-disk image cache shared by all work items. 0 disables the cache.
+IMAGE_CACHE_MEGABYTES = int(os.getenv('NEWS_IMAGE_CACHE_MEGABYTES', 200))
+
+# Largest width or height of the images added to the ZIP file. 0 keeps the downloaded images.
+IMAGE_MAX_DIMENSION = int(os.getenv('NEWS_IMAGE_MAX_DIMENSION', 0))
+
+# JPEG quality used when the images are resized.
+IMAGE_JPEG_QUALITY = int(os.getenv('NEWS_IMAGE_JPEG_QUALITY', 75))
+
+# Number of processes used to resize the images.
+IMAGE_PROCESSES = int(os.getenv('NEWS_IMAGE_PROCESSES', os.cpu_count() or 1))
+
+# Records stage timings and counters of each work item and writes them to the metrics folder.
+METRICS_ENABLED = os.getenv('NEWS_METRICS', 'false').lower() == 'true'
+
+# Folder for the metrics and profiles. It lives outside the output folder so it does not count
+# towards the artifact limits.
+METRICS_PATH = os.getenv('NEWS_METRICS_PATH', 'metrics')
+
+# Optional Prometheus textfile where the metrics of the last work item are also written.
+METRICS_PROMETHEUS_PATH = os.getenv('NEWS_METRICS_PROMETHEUS_PATH')
+
+# Profiles the extraction and output stages with cProfile, writing the stats next to the metrics.
+PROFILE_ENABLED = os.getenv('NEWS_PROFILE', 'false').lower() == 'true'
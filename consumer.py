@@ -1,8 +1,14 @@
 import logging
+from config import WORKERS, COALESCE_ITEMS
+from utils import Utils
 from robocorp import workitems
 from robocorp.tasks import task
+from collections import deque
+from contextlib import nullcontext
+from work_queue import WorkItemQueue
 from news_automation import NewsAutomation
 from business_exception import BusinessException
+from concurrent.futures import ThreadPoolExecutor
 
 logging.basicConfig(format='[%(levelname)s] - %(message)s')
 logger = logging.getLogger(__name__)
@@ -11,20 +17,171 @@ logger.setLevel(logging.INFO)
 
 @task
 def consume_news_workitems():
-    """Consumes news work items, executes news extraction for each item, marks them as done or failed."""
+    """Consumes news work items, executes news extraction for each item, marks them as done or failed.
+
+    The browser is kept open across work items and only restarted after application errors
+    or once it has processed the configured number of items. When more than one worker is
+    configured, the items are processed concurrently by isolated workers. When coalescing is
+    enabled, the items with the same query are crawled once for all of them. Both need several
+    reserved items at once, so they fall back to one item at a time where that is not allowed.
+    """
+
+    if (COALESCE_ITEMS or WORKERS > 1) and WorkItemQueue.can_reserve_concurrently():
+        if COALESCE_ITEMS:
+            run_coalesced_work_items(WORKERS)
+        else:
+            run_worker_pool(WORKERS)
+        return
 
     automation = NewsAutomation()
 
-    for item in workitems.inputs:
+    try:
+        for item in workitems.inputs:
+            process_work_item(automation, item)
+    finally:
+        automation.close()
+
+
+def run_worker_pool(number_of_workers: int):
+    """Processes the input queue with a pool of workers, each one with its own browser and folders."""
+
+    logger.info(f'Starting {number_of_workers} workers...')
+
+    queue = WorkItemQueue()
+
+    with ThreadPoolExecutor(max_workers=number_of_workers, thread_name_prefix='news-worker') as executor:
+        futures = [executor.submit(run_worker, queue, worker_id)
+                   for worker_id in range(1, number_of_workers + 1)]
+
+    for future in futures:
+        future.result()
+
+
+def run_worker(queue: WorkItemQueue, worker_id: int):
+    """Reserves and processes work items until the input queue is empty."""
+
+    automation = NewsAutomation(worker_id)
+
+    try:
+        while (item := queue.reserve()) is not None:
+            process_work_item(automation, item, queue.lock)
+    finally:
+        automation.close()
+
+
+def run_coalesced_work_items(number_of_workers: int):
+    """Reserves every pending work item, groups the ones with the same query and crawls once per group."""
+
+    queue = WorkItemQueue()
+    items = queue.reserve_all()
+    groups = deque(group_work_items(items))
+
+    logger.info(f'{len(items)} work items planned as {len(groups)} crawls.')
+
+    if number_of_workers <= 1:
+        run_group_worker(groups, queue.lock)
+        return
+
+    with ThreadPoolExecutor(max_workers=number_of_workers, thread_name_prefix='news-worker') as executor:
+        futures = [executor.submit(run_group_worker, groups, queue.lock, worker_id)
+                   for worker_id in range(1, number_of_workers + 1)]
+
+    for future in futures:
+        future.result()
+
+
+def group_work_items(items: list[workitems.Input]) -> list[list[workitems.Input]]:
+    """Groups work items by search phrase and news category, with the widest date window first in each group."""
+
+    groups = {}
+
+    for item in items:
         try:
-            automation.setup_extraction(item)
+            news_data = item.payload["news_data"]
+            key = (news_data["search_phrase"], news_data["news_category"])
+            limit_date = Utils.get_inferior_date_interval_from_months(
+                news_data["number_of_months"])
+        except Exception:
+            # Invalid payloads are processed alone, so they fail on their own.
+            key, limit_date = id(item), None
+
+        groups.setdefault(key, []).append((limit_date, item))
+
+    return [[item for _, item in sorted(group, key=lambda entry: entry[0])]
+            for group in groups.values()]
+
+
+def run_group_worker(groups: deque, release_lock, worker_id: int | None = None):
+    """Processes groups of work items until there are none left."""
+
+    automation = NewsAutomation(worker_id)
+
+    try:
+        while groups:
+            try:
+                group = groups.popleft()
+            except IndexError:
+                break
+
+            process_work_item_group(automation, group, release_lock)
+    finally:
+        automation.close()
+
+
+def process_work_item_group(automation: NewsAutomation, group: list[workitems.Input], release_lock=nullcontext()):
+    """Crawls once for the widest work item of a group and splits its news into the outputs of the other items."""
+
+    if len(group) == 1:
+        process_work_item(automation, group[0], release_lock)
+        return
+
+    logger.info(f'Crawling once for {len(group)} work items of the same query...')
+
+    widest_item, *other_items = group
+
+    cards = process_work_item(automation, widest_item, release_lock)
+    output_names = set()
+
+    for index, item in enumerate(other_items, start=2):
+        news_data = item.payload["news_data"]
+        output_name = f'{news_data["search_phrase"]}_{news_data["number_of_months"]}_months'
+
+        # Items with the same number of months would otherwise overwrite each other's output.
+        if output_name in output_names:
+            output_name = f'{output_name}_{index}'
+        output_names.add(output_name)
+
+        # When the shared crawl failed, each item crawls on its own.
+        process_work_item(automation, item, release_lock, output_name, cards)
+
+
+def process_work_item(automation: NewsAutomation, item: workitems.Input, release_lock=nullcontext(), output_name: str | None = None, cards: list | None = None) -> list | None:
+    """Executes the news extraction for a single work item and releases it as done or failed.
+
+    When cards of a wider crawl of the same query are given, they are reused instead of crawling.
+    Returns the cards accepted for the item, or None if it failed.
+    """
+
+    recycle_browser = False
+
+    try:
+        automation.setup_extraction(item, output_name, resume=cards is None)
+        if cards is None:
             automation.execute_news_extraction()
-            automation.create_output_files()
+        else:
+            automation.reuse_extracted_news(cards)
+        automation.create_output_files()
+        accepted_cards = automation.get_extracted_cards()
+        with release_lock:
             item.done()
-        except Exception as e:
+        return accepted_cards
+    except Exception as e:
+        recycle_browser = not isinstance(e, BusinessException)
+        with release_lock:
             handle_exception(item, e)
-        finally:
-            automation.close_resources()
+        return None
+    finally:
+        automation.close_resources(recycle_browser)
 
 
 def handle_exception(item: workitems.Input, exception: Exception):
@@ -0,0 +1,69 @@
+import json
+import sqlite3
+from datetime import datetime
+
+
+class CrawlState:
+    """
+    Remembers the result set of each query between runs, so repeated queries only crawl the new news.
+
+    For every (search phrase, news category) pair it stores the timestamp of the newest news
+    extracted (the high-water mark), the start of the date window that was covered and the
+    cards of the result set, in a SQLite database.
+    """
+
+    def __init__(self, database_path: str):
+        """
+        Initializes the state, connecting to the database.
+
+        Args:
+            database_path (str): Path of the SQLite database.
+        """
+        self.connection = sqlite3.connect(database_path, timeout=30)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS crawl_state (search_phrase TEXT NOT NULL, news_category TEXT NOT NULL, '
+            'high_water_mark INTEGER NOT NULL, covered_since TEXT NOT NULL, cards TEXT NOT NULL, '
+            'PRIMARY KEY (search_phrase, news_category))')
+        self.connection.commit()
+
+    def load(self, search_phrase: str, news_category: str) -> dict | None:
+        """
+        Load the state stored for a query.
+
+        Args:
+            search_phrase (str): Search phrase of the query.
+            news_category (str): News category of the query.
+
+        Returns:
+            (dict | None): Dictionary with the keys 'high_water_mark' (int), 'covered_since' (datetime)
+                and 'cards' (list of dicts), or None if the query was never crawled.
+        """
+        row = self.connection.execute(
+            'SELECT high_water_mark, covered_since, cards FROM crawl_state WHERE search_phrase = ? AND news_category = ?',
+            (search_phrase, news_category or '')).fetchone()
+
+        if row is None:
+            return None
+
+        high_water_mark, covered_since, cards = row
+
+        return {'high_water_mark': high_water_mark,
+                'covered_since': datetime.fromisoformat(covered_since),
+                'cards': json.loads(cards)}
+
+    def save(self, search_phrase: str, news_category: str, high_water_mark: int, covered_since: datetime, cards: list[dict]):
+        """
+        Store the state of a query, replacing the previous one.
+
+        Args:
+            search_phrase (str): Search phrase of the query.
+            news_category (str): News category of the query.
+            high_water_mark (int): Timestamp (in milliseconds) of the newest news extracted.
+            covered_since (datetime): Start of the date window covered by the cards.
+            cards (list[dict]): Cards of the result set, newest first.
+        """
+        self.connection.execute(
+            'INSERT OR REPLACE INTO crawl_state (search_phrase, news_category, high_water_mark, covered_since, cards) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (search_phrase, news_category or '', high_water_mark, covered_since.isoformat(), json.dumps(cards)))
+        self.connection.commit()
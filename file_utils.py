@@ -1,45 +1,538 @@
 import os
+import csv
+import json
 import zipfile
-from typing import Any, List
-from RPA.Excel.Files import Files
+import threading
 
 
-class FileUtils(Files):
+class ExcelStreamWriter:
     """
-    Extends Files functionality with additional file manipulation utilities.
+    Writes rows to an Excel file as they are produced, using a write-only workbook.
+
+    Rows are flushed to a temporary file instead of being kept in memory, so the memory used
+    does not grow with the number of rows. openpyxl is only loaded when a writer is created.
+    """
+
+    def __init__(self, path: str, columns: dict[str, type], tab_name: str = 'Result'):
+        """
+        Creates the write-only workbook and its worksheet, with the header.
+
+        Args:
+            path (str): Path where the Excel file will be saved.
+            columns (dict[str, type]): Columns of the rows and their types, in order.
+            tab_name (str, optional): Name of the worksheet. Defaults to 'Result'.
+        """
+        from openpyxl import Workbook
+
+        self.path = path
+        self.header = list(columns)
+        self.row_count = 0
+        self.workbook = Workbook(write_only=True)
+        self.worksheet = self.workbook.create_sheet(title=tab_name)
+        self.worksheet.append(self.header)
+
+    def append(self, row: dict):
+        """
+        Appends a row to the worksheet.
+
+        Args:
+            row (dict): Row to write, keyed by column name.
+        """
+        self.worksheet.append([row.get(column) for column in self.header])
+        self.row_count += 1
+
+    def close(self):
+        """
+        Saves the Excel file.
+        """
+        self.workbook.save(self.path)
+
+
+class JsonLinesStreamWriter:
+    """
+    Writes rows to a JSON Lines file as they are produced, one JSON object per line.
+    """
+
+    def __init__(self, path: str):
+        """
+        Opens the file.
+
+        Args:
+            path (str): Path where the JSON Lines file will be saved.
+        """
+        self.path = path
+        self.row_count = 0
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def append(self, row: dict):
+        """
+        Appends a row to the file.
+
+        Args:
+            row (dict): Row to write, keyed by column name.
+        """
+        self.file.write(json.dumps(row, ensure_ascii=False) + '\n')
+        self.row_count += 1
+
+    def close(self):
+        """
+        Closes the file.
+        """
+        self.file.close()
+
+
+class CsvStreamWriter:
+    """
+    Writes rows to a CSV file as they are produced, after a header with the given columns.
+    """
+
+    def __init__(self, path: str, columns: dict[str, type]):
+        """
+        Opens the file and writes the header.
+
+        Args:
+            path (str): Path where the CSV file will be saved.
+            columns (dict[str, type]): Columns of the rows and their types, in order.
+        """
+        self.path = path
+        self.row_count = 0
+        self.file = open(path, 'w', encoding='utf-8', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=list(columns))
+        self.writer.writeheader()
+
+    def append(self, row: dict):
+        """
+        Appends a row to the file.
+
+        Args:
+            row (dict): Row to write, keyed by column name.
+        """
+        self.writer.writerow(row)
+        self.row_count += 1
+
+    def close(self):
+        """
+        Closes the file.
+        """
+        self.file.close()
+
+
+class ParquetStreamWriter:
+    """
+    Writes rows to a Parquet file as they are produced, one row group per batch of rows.
+
+    Requires the optional pyarrow package. The schema is built from the given columns, so it is
+    the same for every file, even one without rows.
+    """
+
+    # Parquet types of the Python column types.
+    PARQUET_TYPES = {str: 'string', int: 'int64', float: 'float64', bool: 'bool'}
+
+    def __init__(self, path: str, columns: dict[str, type], batch_size: int = 1000):
+        """
+        Loads pyarrow and prepares the first batch.
+
+        Args:
+            path (str): Path where the Parquet file will be saved.
+            columns (dict[str, type]): Columns of the rows and their types, in order.
+            batch_size (int, optional): Number of rows of each row group. Defaults to 1000.
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError(
+                'The Parquet output format requires the pyarrow package.')
+
+        self.pyarrow = pyarrow
+        self.schema = pyarrow.schema([(column, ParquetStreamWriter.PARQUET_TYPES[column_type])
+                                      for column, column_type in columns.items()])
+        self.path = path
+        self.batch_size = batch_size
+        self.row_count = 0
+        self.rows = []
+        self.writer = None
+
+    def append(self, row: dict):
+        """
+        Appends a row to the current batch, writing the batch once it is full.
+
+        Args:
+            row (dict): Row to write, keyed by column name.
+        """
+        self.rows.append(row)
+        self.row_count += 1
+
+        if len(self.rows) >= self.batch_size:
+            self.write_batch()
+
+    def write_batch(self):
+        """
+        Writes the current batch as a row group.
+        """
+        table = self.pyarrow.Table.from_pylist(self.rows, schema=self.schema)
+
+        if self.writer is None:
+            self.writer = self.pyarrow.parquet.ParquetWriter(self.path, self.schema)
+
+        self.writer.write_table(table)
+        self.rows = []
+
+    def close(self):
+        """
+        Writes the last batch and closes the file.
+        """
+        if self.rows or self.writer is None:
+            self.write_batch()
+
+        self.writer.close()
+
+
+class ZipStreamWriter:
+    """
+    Writes files into a ZIP archive as they become available, within a maximum size.
+
+    Entries are stored uncompressed, so the size of the archive is known before each entry is
+    written and entries that would exceed the budget are rejected instead of being written.
+    Part of the budget can be reserved for entries written later, such as the result files,
+    so the entries written first cannot take the room they need.
     """
 
-    def __init__(self):
+    # Local file header, central directory record and end of central directory overhead.
+    ENTRY_OVERHEAD_BYTES = 30 + 46
+    ARCHIVE_OVERHEAD_BYTES = 22
+
+    def __init__(self, path: str, max_bytes: int | None = None):
+        """
+        Creates the ZIP archive.
+
+        Args:
+            path (str): Path where the ZIP file will be created.
+            max_bytes (int | None, optional): Maximum size of the archive in bytes. Defaults to None (no limit).
         """
-        Initializes FileUtils by invoking the constructor of the base class Files.
+        self.path = path
+        self.max_bytes = max_bytes
+        self.size = self.ARCHIVE_OVERHEAD_BYTES
+        self.reserved_bytes = 0
+        self.file_count = 0
+        self.zip_file = zipfile.ZipFile(path, 'w')
+
+    def can_fit(self, name: str, size: int) -> bool:
         """
-        super().__init__()
+        Check whether an entry fits in the remaining budget.
+
+        Args:
+            name (str): Name of the entry in the archive.
+            size (int): Size of the entry content in bytes.
 
-    def create_excel_file_from_json(self, json: Any, path: str, tab_name: str = 'Result'):
+        Returns:
+            bool: True if the entry fits, False otherwise.
         """
-        Creates an Excel file from a JSON object.
+        if self.max_bytes is None:
+            return True
+
+        return self.size + self.reserved_bytes + self.get_entry_size(name, size) <= self.max_bytes
 
-        This method creates a new Excel file at the specified path and writes the JSON data
-        into a worksheet with the given tab name.
+    def reserve(self, size: int) -> bool:
+        """
+        Reserve part of the remaining budget for entries written later, if it fits.
 
         Args:
-            json (Any): JSON data to be written to the Excel file.
-            path (str): Path where the Excel file will be created.
-            tab_name (str, optional): Name of the worksheet/tab where the JSON data will be written. Defaults to 'Result'.
+            size (int): Number of bytes to reserve.
 
         Returns:
-            None
+            bool: True if the bytes were reserved, False if they do not fit.
+        """
+        if self.max_bytes is not None and self.size + self.reserved_bytes + size > self.max_bytes:
+            return False
+
+        self.reserved_bytes += size
+
+        return True
+
+    def release_reserved(self):
+        """
+        Releases the reserved budget, right before writing the entries it was reserved for.
+        """
+        self.reserved_bytes = 0
+
+    def get_entry_size(self, name: str, size: int) -> int:
+        """
+        Calculate the number of bytes an uncompressed entry takes in the archive.
+
+        Args:
+            name (str): Name of the entry in the archive.
+            size (int): Size of the entry content in bytes.
+
+        Returns:
+            int: Size of the entry in the archive.
+        """
+        return size + self.ENTRY_OVERHEAD_BYTES + 2 * len(name.encode('utf-8'))
+
+    def write_bytes(self, name: str, data: bytes) -> bool:
+        """
+        Write an entry from memory if it fits in the budget.
+
+        Args:
+            name (str): Name of the entry in the archive.
+            data (bytes): Content of the entry.
+
+        Returns:
+            bool: True if the entry was written, False if it does not fit.
+        """
+        if not self.can_fit(name, len(data)):
+            return False
+
+        self.zip_file.writestr(name, data)
+        self.size += self.get_entry_size(name, len(data))
+        self.file_count += 1
+
+        return True
+
+    def write_file(self, path: str, name: str | None = None) -> bool:
+        """
+        Write an entry from a file if it fits in the budget.
+
+        Args:
+            path (str): Path of the file.
+            name (str | None, optional): Name of the entry in the archive. Defaults to the file name.
+
+        Returns:
+            bool: True if the entry was written, False if it does not fit.
+        """
+        name = name or os.path.basename(path)
+        size = os.path.getsize(path)
+
+        if not self.can_fit(name, size):
+            return False
+
+        self.zip_file.write(path, name)
+        self.size += self.get_entry_size(name, size)
+        self.file_count += 1
+
+        return True
+
+    def close(self):
+        """
+        Finishes the archive.
+        """
+        self.zip_file.close()
+
+    def discard(self):
+        """
+        Closes and deletes the archive.
+        """
+        self.zip_file.close()
+
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class QuotaLedger:
+    """
+    Keeps the number of files and the total size of a directory as artifacts are written and deleted.
+
+    The directory is walked only once, when the ledger is created. After that, budget queries are
+    answered from the running totals.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initializes the ledger and synchronizes it with the files on disk.
+
+        Args:
+            path (str): The path to the directory.
+        """
+        self.path = os.path.abspath(path)
+        self.lock = threading.Lock()
+        self.file_sizes = {}
+        self.total_bytes = 0
+        self.sync()
+
+    def sync(self):
+        """
+        Rebuilds the ledger from the files on disk.
+        """
+        with self.lock:
+            self.file_sizes = {}
+            for dirpath, _, filenames in os.walk(self.path):
+                for filename in filenames:
+                    filepath = os.path.join(dirpath, filename)
+                    if os.path.isfile(filepath):
+                        self.file_sizes[filepath] = os.path.getsize(filepath)
+            self.total_bytes = sum(self.file_sizes.values())
+
+    def contains(self, path: str) -> bool:
+        """
+        Check whether a path is inside the directory of the ledger.
+
+        Args:
+            path (str): The path to check.
+
+        Returns:
+            bool: True if the path is inside the directory, False otherwise.
+        """
+        return os.path.abspath(path).startswith(self.path + os.sep) or os.path.abspath(path) == self.path
+
+    def record(self, path: str):
+        """
+        Records the current size of a file that was written or updated.
+
+        Args:
+            path (str): The path to the file.
+        """
+        path = os.path.abspath(path)
+        size = os.path.getsize(path) if os.path.isfile(path) else 0
+
+        with self.lock:
+            self.total_bytes += size - self.file_sizes.get(path, 0)
+            self.file_sizes[path] = size
+
+    def forget(self, path: str):
+        """
+        Removes a deleted file from the ledger.
+
+        Args:
+            path (str): The path to the file.
+        """
+        with self.lock:
+            self.total_bytes -= self.file_sizes.pop(os.path.abspath(path), 0)
+
+    @property
+    def file_count(self) -> int:
+        """
+        Number of files in the directory.
+        """
+        return len(self.file_sizes)
+
+    @property
+    def megabytes(self) -> float:
+        """
+        Total size of the files in the directory, in megabytes.
         """
+        return self.total_bytes / (1024 * 1024)
 
-        self.create_workbook(path=path)
-        self.create_worksheet(name=tab_name, content=json, header=True)
-        self.save_workbook(path=path)
 
-    def create_zip_from_files(self, zip_path: str, files: List):
+class FileUtils:
+    """
+    File manipulation utilities for the result files and the output folder.
+
+    The Excel libraries are only loaded when an Excel file is written.
+    """
+
+    # Quota ledgers of the tracked directories, shared by every instance in the process.
+    quota_ledgers = {}
+    quota_ledgers_lock = threading.Lock()
+
+    def track_directory(self, path: str) -> QuotaLedger:
+        """
+        Starts keeping a quota ledger for a directory, walking it only the first time.
+
+        Once tracked, the file count and size of the directory are answered from the ledger,
+        which is kept up to date by record_file and delete_file.
+
+        Args:
+            path (str): The path to the directory.
+
+        Returns:
+            QuotaLedger: The ledger of the directory.
+        """
+        key = os.path.abspath(path)
+
+        with self.quota_ledgers_lock:
+            if key not in self.quota_ledgers:
+                self.quota_ledgers[key] = QuotaLedger(path)
+            return self.quota_ledgers[key]
+
+    def get_quota_ledger(self, path: str) -> QuotaLedger | None:
+        """
+        Get the ledger of the tracked directory that contains a path.
+
+        Args:
+            path (str): The path to a tracked directory or to a file inside one.
+
+        Returns:
+            (QuotaLedger | None): The ledger, or None if the path is not in a tracked directory.
+        """
+        for ledger in list(self.quota_ledgers.values()):
+            if ledger.contains(path):
+                return ledger
+        return None
+
+    def record_file(self, path: str):
+        """
+        Records a written or updated file in the ledger of its tracked directory, if any.
+
+        Args:
+            path (str): The path to the file.
+        """
+        ledger = self.get_quota_ledger(path)
+        if ledger:
+            ledger.record(path)
+
+    def forget_file(self, path: str):
+        """
+        Removes a file deleted outside FileUtils from the ledger of its tracked directory, if any.
 
-        with zipfile.ZipFile(zip_path, 'w') as zip_file:
-            for file in files:
-                zip_file.write(file, os.path.basename(file))
+        Args:
+            path (str): The path to the file.
+        """
+        ledger = self.get_quota_ledger(path)
+        if ledger:
+            ledger.forget(path)
+
+    def open_excel_stream(self, path: str, columns: dict[str, type], tab_name: str = 'Result') -> ExcelStreamWriter:
+        """
+        Opens an Excel file to be written row by row.
+
+        Args:
+            path (str): Path where the Excel file will be saved.
+            columns (dict[str, type]): Columns of the rows and their types, in order.
+            tab_name (str, optional): Name of the worksheet. Defaults to 'Result'.
+
+        Returns:
+            ExcelStreamWriter: Writer that appends rows and saves the file when closed.
+        """
+
+        return ExcelStreamWriter(path, columns, tab_name)
+
+    def open_result_stream(self, path: str, output_format: str, columns: dict[str, type]) -> ExcelStreamWriter | JsonLinesStreamWriter | CsvStreamWriter | ParquetStreamWriter:
+        """
+        Opens a result file to be written row by row in the given format.
+
+        Args:
+            path (str): Path where the file will be saved.
+            output_format (str): Format of the file: 'xlsx', 'jsonl', 'csv' or 'parquet'.
+            columns (dict[str, type]): Columns of the rows and their types, in order.
+
+        Returns:
+            (ExcelStreamWriter | JsonLinesStreamWriter | CsvStreamWriter | ParquetStreamWriter): Writer that
+                appends rows and finishes the file when closed.
+        """
+        if output_format == 'xlsx':
+            return self.open_excel_stream(path, columns)
+        if output_format == 'jsonl':
+            return JsonLinesStreamWriter(path)
+        if output_format == 'csv':
+            return CsvStreamWriter(path, columns)
+        if output_format == 'parquet':
+            return ParquetStreamWriter(path, columns)
+
+        raise ValueError(f'Unknown output format "{output_format}".')
+
+    def open_zip_stream(self, path: str, max_bytes: int | None = None) -> ZipStreamWriter:
+        """
+        Opens a ZIP file to be written entry by entry within a maximum size.
+
+        Args:
+            path (str): Path where the ZIP file will be created.
+            max_bytes (int | None, optional): Maximum size of the archive in bytes. Defaults to None (no limit).
+
+        Returns:
+            ZipStreamWriter: Writer that adds entries while they fit in the budget.
+        """
+
+        return ZipStreamWriter(path, max_bytes)
 
     def delete_files_from_folder(self, path: str):
         """
@@ -60,7 +553,7 @@ class FileUtils(Files):
         for file in files:
             file_path = os.path.join(path, file)
             if os.path.isfile(file_path):
-                os.remove(file_path)
+                self.delete_file(file_path)
 
     def delete_file(self, path: str):
         """
@@ -73,6 +566,7 @@ class FileUtils(Files):
             None
         """
         os.remove(path)
+        self.forget_file(path)
 
     def get_megabytes_size_of_directory(self, path: str) -> float:
         """
@@ -84,6 +578,10 @@ class FileUtils(Files):
         Returns:
             float: The total size of the directory in megabytes.
         """
+        ledger = self.quota_ledgers.get(os.path.abspath(path))
+        if ledger:
+            return ledger.megabytes
+
         total_size_bytes = 0
         for dirpath, dirnames, filenames in os.walk(path):
             for filename in filenames:
@@ -103,6 +601,10 @@ class FileUtils(Files):
         Returns:
             int: The total number of files in the directory.
         """
+        ledger = self.quota_ledgers.get(os.path.abspath(path))
+        if ledger:
+            return ledger.file_count
+
         file_count = 0
         for _, _, filenames in os.walk(path):
             file_count += len(filenames)
@@ -0,0 +1,327 @@
+import re
+import threading
+import requests
+from typing import Iterator
+from collections import deque
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from card_parser import CardParser
+from urllib.parse import urlencode, urlsplit, urlunsplit, parse_qsl
+from requests.adapters import HTTPAdapter
+from concurrent.futures import CancelledError, ThreadPoolExecutor, wait
+
+
+@dataclass(frozen=True)
+class ResultsPage:
+    """
+    Parts of a search results page used by the extraction.
+    """
+
+    results_html: str
+    total_pages: int
+    next_page_inactive: bool
+    category_filters: dict[str, tuple[str, str]]
+
+
+class ResultsPageParser(HTMLParser):
+    """
+    Parses a search results page with an HTML parser, in the same way as CardParser.
+
+    Locates the results list, the page counts, the next page button and the category filters
+    by the (tag, class) selectors below. The list is tracked by depth, so nested lists inside
+    the cards do not end it early.
+    """
+
+    results_selector = ('ul', 'search-results-module-results-menu')
+    page_counts_selector = (None, 'search-results-module-page-counts')
+    next_page_selector = (None, 'search-results-module-next-page')
+    filter_label_selector = ('label', None)
+
+    total_pages_pattern = re.compile(r'of\s+([\d.,]+)')
+
+    def __init__(self, html: str):
+        """
+        Initializes the parser state.
+
+        Args:
+            html (str): HTML of the search results page, used to slice the results list.
+        """
+        super().__init__(convert_charrefs=True)
+        self.html = html
+        self.line_offsets = [0] + [match.end() for match in re.finditer('\n', html)]
+        self.results_start = None
+        self.results_end = None
+        self.results_depth = 0
+        self.page_counts = None
+        self.next_page_inactive = None
+        self.label = None
+        self.category_filters = {}
+        self.capture = None
+        self.capture_tag = None
+        self.capture_depth = 0
+        self.text = []
+
+    @classmethod
+    def parse(cls, html: str) -> ResultsPage:
+        """
+        Parse the parts of a search results page.
+
+        Args:
+            html (str): HTML of the search results page.
+
+        Returns:
+            ResultsPage: The parts of the page.
+
+        Raises:
+            Exception: If the page has no search results list.
+        """
+        parser = cls(html)
+        parser.feed(html)
+        parser.close()
+
+        if parser.results_start is None or parser.results_end is None:
+            raise Exception('Search results list not found in the page.')
+
+        match = parser.total_pages_pattern.search(parser.page_counts or '')
+        total_pages = int(match.group(1).replace(",", "").replace(".", "")) if match else 1
+
+        return ResultsPage(
+            results_html=html[parser.results_start:parser.results_end],
+            total_pages=total_pages,
+            next_page_inactive=parser.next_page_inactive is not False,
+            category_filters=parser.category_filters)
+
+    def get_offset(self) -> int:
+        """
+        Get the offset in the HTML of the tag being handled.
+
+        Returns:
+            int: Offset of the start of the tag.
+        """
+        line, column = self.getpos()
+        return self.line_offsets[line - 1] + column
+
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+        classes = (attributes.get('class') or '').split()
+
+        if self.results_depth:
+            if tag == self.results_selector[0]:
+                self.results_depth += 1
+            return
+
+        if self.capture:
+            if tag == self.capture_tag:
+                self.capture_depth += 1
+
+            if self.label is not None and tag == 'input':
+                self.label['name'] = attributes.get('name')
+                self.label['value'] = attributes.get('value')
+            return
+
+        if self.results_start is None and CardParser.matches(self.results_selector, tag, classes):
+            self.results_start = self.get_offset() + len(self.get_starttag_text())
+            self.results_depth = 1
+
+        elif CardParser.matches(self.page_counts_selector, tag, classes):
+            self.start_capture('page_counts', tag)
+
+        elif CardParser.matches(self.next_page_selector, tag, classes):
+            self.next_page_inactive = 'data-inactive' in attributes
+
+        elif CardParser.matches(self.filter_label_selector, tag, classes):
+            self.label = {'name': None, 'value': None}
+            self.start_capture('label', tag)
+
+    def handle_endtag(self, tag):
+        if self.results_depth:
+            if tag == self.results_selector[0]:
+                self.results_depth -= 1
+                if self.results_depth == 0:
+                    self.results_end = self.get_offset()
+            return
+
+        if self.capture and tag == self.capture_tag:
+            self.capture_depth -= 1
+            if self.capture_depth == 0:
+                self.finish_capture()
+
+    def handle_data(self, data):
+        if self.capture:
+            self.text.append(data)
+
+    def start_capture(self, field: str, tag: str):
+        """
+        Starts collecting the text of an element.
+
+        Args:
+            field (str): Name of the part of the page being collected.
+            tag (str): Tag of the element whose text is collected.
+        """
+        self.capture = field
+        self.capture_tag = tag
+        self.capture_depth = 1
+        self.text = []
+
+    def finish_capture(self):
+        """
+        Stores the text collected for the current part of the page.
+        """
+        text = ' '.join(''.join(self.text).split())
+
+        if self.capture == 'page_counts':
+            self.page_counts = text
+        elif self.label['name'] and self.label['value'] is not None:
+            self.category_filters.setdefault(text, (self.label['name'], self.label['value']))
+
+        self.capture = None
+        self.label = None
+
+
+class HttpSearch:
+    """
+    Reads the search results of the news website over plain HTTP, without a browser.
+
+    Builds the search URLs (query, category filter, sort order and page number) and
+    fetches them through a pooled keep-alive session.
+    """
+
+    NEWEST_SORT = 1
+
+    def __init__(self, base_url: str, timeout: int = 30, pool_size: int = 4):
+        """
+        Initializes the pooled HTTP session.
+
+        Args:
+            base_url (str): Base URL of the news website.
+            timeout (int, optional): Timeout (in seconds) for each request. Defaults to 30.
+            pool_size (int, optional): Maximum number of kept-alive connections. Defaults to 4.
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+
+        adapter = HTTPAdapter(pool_connections=pool_size,
+                              pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def build_search_url(self, search_phrase: str, category_filter: tuple[str, str] | None = None, page: int = 1) -> str:
+        """
+        Build the URL of a search results page sorted by the newest news.
+
+        Args:
+            search_phrase (str): Phrase to search for.
+            category_filter (tuple[str, str] | None, optional): Name and value of the category filter. Defaults to None.
+            page (int, optional): Number of the results page. Defaults to 1.
+
+        Returns:
+            str: URL of the search results page.
+        """
+        query = {'q': search_phrase}
+
+        if category_filter:
+            name, value = category_filter
+            query[name] = value
+
+        query['s'] = self.NEWEST_SORT
+        query['p'] = page
+
+        return f'{self.base_url}/search?{urlencode(query)}'
+
+    def get_page_url(url: str, page: int) -> str:
+        """
+        Change the page number of a search results URL, keeping its query, filters and sort order.
+
+        Args:
+            url (str): URL of a search results page.
+            page (int): Number of the results page.
+
+        Returns:
+            str: URL of the given results page.
+        """
+        parts = urlsplit(url)
+        query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != 'p']
+        query.append(('p', page))
+
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
+    def fetch_page(self, url: str) -> str:
+        """
+        Fetch the HTML of a page.
+
+        Args:
+            url (str): URL of the page.
+
+        Returns:
+            str: HTML of the page.
+        """
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    def fetch_pages(self, urls: list[str], concurrency: int, cancelled: threading.Event | None = None) -> Iterator[str]:
+        """
+        Fetch several pages concurrently, yielding their HTML in the order of the URLs.
+
+        At most `concurrency` pages are requested ahead of the one being consumed. Closing the
+        generator, or setting the cancellation event, cancels the pages that were not requested
+        yet. A cancellation raises CancelledError instead of waiting for the current page.
+
+        Args:
+            urls (list[str]): URLs of the pages.
+            concurrency (int): Maximum number of pages fetched at the same time.
+            cancelled (threading.Event | None, optional): Event that stops the prefetch once set. Defaults to None.
+
+        Returns:
+            Iterator[str]: HTML of each page.
+        """
+        pending_urls = iter(urls)
+        futures = deque()
+        executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix='page-fetch')
+
+        try:
+            for url in pending_urls:
+                futures.append(executor.submit(self.fetch_page, url))
+                if len(futures) == concurrency:
+                    break
+
+            while futures:
+                future = futures.popleft()
+
+                while not future.done():
+                    if cancelled is not None and cancelled.is_set():
+                        raise CancelledError()
+                    wait([future], timeout=0.1)
+
+                html = future.result()
+
+                url = next(pending_urls, None)
+                if url is not None:
+                    futures.append(executor.submit(self.fetch_page, url))
+
+                yield html
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def parse_page(self, html: str) -> ResultsPage:
+        """
+        Parse the results list, page counts, next page state and category filters of a page.
+
+        Args:
+            html (str): HTML of the search results page.
+
+        Returns:
+            ResultsPage: The parts of the page.
+
+        Raises:
+            Exception: If the page has no search results list.
+        """
+        return ResultsPageParser.parse(html)
+
+    def close(self):
+        """
+        Releases the pooled HTTP session.
+        """
+        self.session.close()
@@ -0,0 +1,137 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class ImageCache:
+    """
+    Persistent on-disk cache of downloaded images with a size-bounded LRU eviction policy.
+
+    Each image is stored under the SHA-256 hash of its URL, next to a JSON file with the
+    validators (ETag and Last-Modified) needed to revalidate it with a conditional request.
+    Images without validators are not stored, since they could never be revalidated.
+    """
+
+    def __init__(self, path: str, max_megabytes: float):
+        """
+        Initializes the cache, indexing the images already stored in its folder.
+
+        Args:
+            path (str): Folder where the images are stored.
+            max_megabytes (float): Maximum total size of the cached images, in megabytes.
+        """
+        self.path = path
+        self.max_bytes = max_megabytes * 1024 * 1024
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+
+        os.makedirs(path, exist_ok=True)
+
+        files = [file for file in os.scandir(path)
+                 if file.is_file() and len(file.name) == 64]
+
+        for file in sorted(files, key=lambda file: file.stat().st_mtime):
+            self.entries[file.name] = file.stat().st_size
+            self.total_bytes += file.stat().st_size
+
+    def get_key(url: str) -> str:
+        """
+        Build the cache key of an image URL.
+
+        Args:
+            url (str): URL of the image.
+
+        Returns:
+            str: Hexadecimal hash of the URL.
+        """
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def get(self, url: str) -> tuple[bytes, dict] | None:
+        """
+        Get a cached image and its validators, marking it as recently used.
+
+        Args:
+            url (str): URL of the image.
+
+        Returns:
+            (tuple[bytes, dict] | None): Content and validators of the image, or None if it is not cached
+                or has no validators.
+        """
+        key = ImageCache.get_key(url)
+
+        with self.lock:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+
+        try:
+            with open(os.path.join(self.path, key), 'rb') as file:
+                data = file.read()
+            with open(os.path.join(self.path, f'{key}.json')) as file:
+                validators = json.load(file)
+            os.utime(os.path.join(self.path, key))
+        except (OSError, ValueError):
+            # Evicted or being replaced by another worker in the meantime.
+            return None
+
+        # Stored without validators by an earlier version, so it could never be revalidated.
+        if not validators:
+            return None
+
+        return data, validators
+
+    def put(self, url: str, data: bytes, validators: dict):
+        """
+        Store an image, evicting the least recently used ones while the cache is over its size.
+
+        Args:
+            url (str): URL of the image.
+            data (bytes): Content of the image.
+            validators (dict): ETag and Last-Modified headers of the response.
+        """
+        key = ImageCache.get_key(url)
+
+        if not validators or len(data) > self.max_bytes:
+            return
+
+        # Written to temporary files first, so concurrent readers never see partial content.
+        suffix = f'{threading.get_ident()}.tmp'
+
+        with open(os.path.join(self.path, f'{key}.json.{suffix}'), 'w') as file:
+            json.dump(validators, file)
+        with open(os.path.join(self.path, f'{key}.{suffix}'), 'wb') as file:
+            file.write(data)
+
+        os.replace(os.path.join(self.path, f'{key}.json.{suffix}'),
+                   os.path.join(self.path, f'{key}.json'))
+        os.replace(os.path.join(self.path, f'{key}.{suffix}'),
+                   os.path.join(self.path, key))
+
+        with self.lock:
+            self.total_bytes += len(data) - self.entries.pop(key, 0)
+            self.entries[key] = len(data)
+
+            while self.total_bytes > self.max_bytes:
+                evicted_key, size = self.entries.popitem(last=False)
+                self.total_bytes -= size
+                for file_name in (evicted_key, f'{evicted_key}.json'):
+                    try:
+                        os.remove(os.path.join(self.path, file_name))
+                    except OSError:
+                        pass
+
+    def touch(self, url: str):
+        """
+        Marks a cached image as recently used, after it was revalidated.
+
+        Args:
+            url (str): URL of the image.
+        """
+        key = ImageCache.get_key(url)
+
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
@@ -0,0 +1,110 @@
+import requests
+from metrics import Metrics
+from image_cache import ImageCache
+from requests.adapters import HTTPAdapter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from image_processor import ImageProcessor
+
+
+class ImageDownloader:
+    """
+    Downloads images through a pooled keep-alive session shared by the threads calling it.
+
+    Downloads run in the threads of the caller, usually the enrichment stage of the extraction
+    pipeline, and reuse the connections to the image hosts. When a cache is given, cached images
+    are revalidated with conditional requests instead of being downloaded again. When a processor
+    is given, every image goes through it after being downloaded.
+    """
+
+    def __init__(self, pool_size: int, timeout: int = 30, cache: ImageCache | None = None, processor: 'ImageProcessor | None' = None, metrics: Metrics | None = None):
+        """
+        Initializes the shared HTTP session.
+
+        Args:
+            pool_size (int): Maximum number of kept-alive connections, usually the number of threads downloading.
+            timeout (int, optional): Timeout (in seconds) for each request. Defaults to 30.
+            cache (ImageCache | None, optional): Cache of downloaded images. Defaults to None.
+            processor (ImageProcessor | None, optional): Processor applied to the downloaded images. Defaults to None.
+            metrics (Metrics | None, optional): Metrics receiving the download timings and counters. Defaults to None.
+        """
+        self.timeout = timeout
+        self.cache = cache
+        self.processor = processor
+        self.metrics = metrics or Metrics()
+        self.session = requests.Session()
+
+        adapter = HTTPAdapter(pool_connections=pool_size,
+                              pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def download(self, url: str) -> bytes:
+        """
+        Downloads a file into memory and applies the processor, if any.
+
+        Args:
+            url (str): URL of the file to download.
+
+        Returns:
+            bytes: Content of the file.
+        """
+        with self.metrics.span('image_download'):
+            data = self.fetch(url)
+
+        if self.processor:
+            with self.metrics.span('image_processing'):
+                data = self.processor.process(data)
+
+        return data
+
+    def fetch(self, url: str) -> bytes:
+        """
+        Fetches a file into memory, going through the cache when there is one.
+
+        The request carries the validators of the cached file and a 304 response returns the
+        cached content.
+
+        Args:
+            url (str): URL of the file to fetch.
+
+        Returns:
+            bytes: Content of the file.
+        """
+        cached = self.cache.get(url) if self.cache else None
+        headers = {}
+
+        if cached:
+            _, validators = cached
+
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+
+        with self.session.get(url, headers=headers, timeout=self.timeout) as response:
+            if cached and response.status_code == 304:
+                self.metrics.increment('image_cache_hits')
+                self.cache.touch(url)
+                return cached[0]
+
+            response.raise_for_status()
+
+            self.metrics.increment('bytes_downloaded', len(response.content))
+
+            if self.cache:
+                validators = {}
+                if response.headers.get('ETag'):
+                    validators['etag'] = response.headers['ETag']
+                if response.headers.get('Last-Modified'):
+                    validators['last_modified'] = response.headers['Last-Modified']
+                self.cache.put(url, response.content, validators)
+
+            return response.content
+
+    def close(self):
+        """
+        Releases the HTTP session.
+        """
+        self.session.close()
@@ -0,0 +1,72 @@
+import multiprocessing
+from io import BytesIO
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+
+
+def shrink_image(data: bytes, max_dimension: int, quality: int) -> bytes:
+    """
+    Resize an image to fit a maximum dimension and recompress it as JPEG.
+
+    Args:
+        data (bytes): Content of the image.
+        max_dimension (int): Largest width or height of the resulting image.
+        quality (int): JPEG quality of the resulting image.
+
+    Returns:
+        bytes: Content of the resized image, or the original content if it is not smaller or not an image.
+    """
+    try:
+        with Image.open(BytesIO(data)) as image:
+            image.thumbnail((max_dimension, max_dimension))
+
+            if image.mode not in ('RGB', 'L'):
+                image = image.convert('RGB')
+
+            output = BytesIO()
+            image.save(output, 'JPEG', quality=quality, optimize=True)
+    except Exception:
+        return data
+
+    result = output.getvalue()
+
+    return result if len(result) < len(data) else data
+
+
+class ImageProcessor:
+    """
+    Resizes and recompresses images in a pool of processes, so the work runs in parallel with extraction.
+    """
+
+    def __init__(self, max_dimension: int, quality: int, processes: int):
+        """
+        Initializes the process pool. Workers are spawned instead of forked, since the pool is
+        started from a download thread while other threads may hold locks.
+
+        Args:
+            max_dimension (int): Largest width or height of the resulting images.
+            quality (int): JPEG quality of the resulting images.
+            processes (int): Number of processes in the pool.
+        """
+        self.max_dimension = max_dimension
+        self.quality = quality
+        self.executor = ProcessPoolExecutor(
+            max_workers=processes, mp_context=multiprocessing.get_context('spawn'))
+
+    def process(self, data: bytes) -> bytes:
+        """
+        Resizes an image in the process pool, blocking the calling thread until it is done.
+
+        Args:
+            data (bytes): Content of the image.
+
+        Returns:
+            bytes: Content of the processed image.
+        """
+        return self.executor.submit(shrink_image, data, self.max_dimension, self.quality).result()
+
+    def close(self):
+        """
+        Shuts the process pool down.
+        """
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,171 @@
+import os
+import json
+import cProfile
+import tempfile
+import threading
+from time import perf_counter
+from contextlib import contextmanager
+
+
+class Metrics:
+    """
+    Records span timings and counters of the stages of a work item.
+
+    When disabled, spans and counters do nothing, so the instrumentation can stay in the hot
+    paths at almost no cost.
+    """
+
+    def __init__(self, enabled: bool = False, profile: bool = False):
+        """
+        Initializes an empty set of metrics.
+
+        Args:
+            enabled (bool, optional): Whether spans and counters are recorded. Defaults to False.
+            profile (bool, optional): Whether the profiled stages run under cProfile. Defaults to False.
+        """
+        self.enabled = enabled
+        self.profile_enabled = profile
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Discards the recorded spans, counters and profile.
+        """
+        self.started = perf_counter()
+        self.spans = []
+        self.counters = {}
+        self.profiler = cProfile.Profile() if self.profile_enabled else None
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """
+        Records the duration of the enclosed block.
+
+        Args:
+            name (str): Name of the stage.
+            **attributes: Additional values stored with the span, such as the page number.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start = perf_counter()
+
+        try:
+            yield
+        finally:
+            span = {'name': name, 'start': start - self.started,
+                    'duration': perf_counter() - start, **attributes}
+            with self.lock:
+                self.spans.append(span)
+
+    @contextmanager
+    def profile(self):
+        """
+        Runs the enclosed block under cProfile, if profiling is enabled.
+        """
+        if self.profiler is None:
+            yield
+            return
+
+        self.profiler.enable()
+
+        try:
+            yield
+        finally:
+            self.profiler.disable()
+
+    def increment(self, counter: str, value: int = 1):
+        """
+        Adds a value to a counter.
+
+        Args:
+            counter (str): Name of the counter.
+            value (int, optional): Value to add. Defaults to 1.
+        """
+        if not self.enabled:
+            return
+
+        with self.lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def summarize(self) -> dict:
+        """
+        Summarize the recorded metrics.
+
+        Returns:
+            dict: Total duration and number of calls of each stage, the counters and every span.
+        """
+        with self.lock:
+            spans = list(self.spans)
+            counters = dict(self.counters)
+
+        stages = {}
+        for span in spans:
+            stage = stages.setdefault(span['name'], {'count': 0, 'seconds': 0.0})
+            stage['count'] += 1
+            stage['seconds'] += span['duration']
+
+        return {'elapsed_seconds': perf_counter() - self.started, 'stages': stages,
+                'counters': counters, 'spans': spans}
+
+    def export_json(self, path: str):
+        """
+        Write the summary of the metrics to a JSON file.
+
+        Args:
+            path (str): Path of the JSON file.
+        """
+        with open(path, 'w') as file:
+            json.dump(self.summarize(), file, indent=2)
+
+    def export_prometheus(self, path: str, labels: dict):
+        """
+        Write the metrics to a Prometheus textfile, replacing it atomically.
+
+        Args:
+            path (str): Path of the textfile.
+            labels (dict): Labels added to every sample, such as the search phrase.
+        """
+        summary = self.summarize()
+
+        def format_labels(extra: dict) -> str:
+            values = {**labels, **extra}
+            escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+                       for value in values.values())
+            return ','.join(f'{key}="{value}"' for key, value in zip(values.keys(), escaped))
+
+        lines = ['# TYPE news_automation_stage_seconds gauge']
+        lines += [f'news_automation_stage_seconds{{{format_labels({"stage": name})}}} {stage["seconds"]}'
+                  for name, stage in summary['stages'].items()]
+        lines += ['# TYPE news_automation_stage_calls gauge']
+        lines += [f'news_automation_stage_calls{{{format_labels({"stage": name})}}} {stage["count"]}'
+                  for name, stage in summary['stages'].items()]
+        lines += ['# TYPE news_automation_counter gauge']
+        lines += [f'news_automation_counter{{{format_labels({"counter": name})}}} {value}'
+                  for name, value in summary['counters'].items()]
+
+        # Each writer gets its own temporary file, so concurrent workers never replace a half written one.
+        descriptor, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path) or '.', prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+
+        try:
+            with os.fdopen(descriptor, 'w') as file:
+                file.write('\n'.join(lines) + '\n')
+            # mkstemp creates the file readable by its owner only, unlike the textfile collector expects.
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def export_profile(self, path: str):
+        """
+        Write the cProfile stats, if profiling is enabled.
+
+        Args:
+            path (str): Path of the stats file.
+        """
+        if self.profiler is not None:
+            self.profiler.dump_stats(path)
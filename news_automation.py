@@ -1,14 +1,43 @@
+import os
+import sys
+import json
 import logging
+import threading
 from utils import Utils
-from RPA.HTTP import HTTP
 from robocorp import workitems
-from file_utils import FileUtils
-from re import search, DOTALL, IGNORECASE
-from browser_utils import BrowserUtils
+from card_parser import CardParser, NewsCard
+from news_index import NewsIndex
+from checkpoint_store import CheckpointStore
+from crawl_state import CrawlState
+from text_analyzer import TextAnalyzer
+from news_store import NewsStore, NewsRecord, NEWS_COLUMNS
+from metrics import Metrics
+from pipeline import Pipeline
+from config import ENRICHMENT_WORKERS, REUSE_BROWSER, BROWSER_RECYCLE_ITEMS, BROWSER_PROFILE, BROWSER_BLOCKED_RESOURCES, BROWSER_BLOCKED_DOMAINS, WEBSITE_URL, SEARCH_BACKEND, MATCH_WHOLE_WORDS, CACHE_PATH, STORE_MAX_ROWS_IN_MEMORY, PERSIST_SEEN_NEWS, INCREMENTAL_CRAWL, CHECKPOINT_MAX_AGE_HOURS, PAGE_FETCH_CONCURRENCY, PIPELINE_QUEUE_SIZE, OUTPUT_FORMATS, OUTPUT_BUDGET_POLICY, IMAGE_CACHE_MEGABYTES, IMAGE_MAX_DIMENSION, IMAGE_JPEG_QUALITY, IMAGE_PROCESSES, METRICS_ENABLED, METRICS_PATH, METRICS_PROMETHEUS_PATH, PROFILE_ENABLED
+from dataclasses import asdict
+from datetime import datetime
+from concurrent.futures import CancelledError
+from image_cache import ImageCache
 from business_exception import BusinessException
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from file_utils import FileUtils
+    from http_search import HttpSearch
+    from browser_utils import BrowserUtils
+    from image_processor import ImageProcessor
+    from image_downloader import ImageDownloader
 
 TEMP_PATH = 'temp'
 OUTPUT_PATH = 'output'
+MAX_OUTPUT_FILES = 50
+MAX_OUTPUT_MEGABYTES = 20
+
+# Element of the search results page whose changes tell whether the results are still loading.
+RESULTS_MODULE_SELECTOR = 'ps-search-results-module'
+
+# Estimated size of a result file without rows, such as the styles and metadata of a workbook.
+RESULT_FILE_BASE_BYTES = 8 * 1024
 
 logging.basicConfig(format='[%(levelname)s] - %(message)s')
 logger = logging.getLogger(__name__)
@@ -17,50 +46,406 @@ logger.setLevel(logging.INFO)
 
 class NewsAutomation:
 
-    def __init__(self):
-        self.http = HTTP()
-        self.files = FileUtils()
-        self.browser = BrowserUtils()
-        self.files.create_folder(TEMP_PATH)
-        self.files.create_folder(OUTPUT_PATH)
+    # Serializes the output budget checks of concurrent workers sharing OUTPUT_PATH.
+    output_lock = threading.Lock()
+
+    # Image cache and image processor shared by every worker, created by the first one
+    # and released by the last one to close.
+    image_cache = None
+    image_processor = None
+    open_instances = 0
+    shared_resources_lock = threading.Lock()
+
+    def __init__(self, worker_id: int | None = None):
+        namespace = '' if worker_id is None else f'/worker_{worker_id}'
+        self.temp_path = f'{TEMP_PATH}{namespace}'
+        self.output_path = f'{OUTPUT_PATH}{namespace}'
+        self.metrics_path = f'{METRICS_PATH}{namespace}'
+        self.metrics = Metrics(METRICS_ENABLED, PROFILE_ENABLED)
+        self.search_phrase = None
+        self._downloader = None
+        self.pipeline = None
+        self.news_count = 0
+        self.news_store = NewsStore(
+            f'{self.temp_path}/news_store.jsonl', STORE_MAX_ROWS_IN_MEMORY)
+        self.result_writers = []
+        self.result_files = []
+        self.zip_writer = None
+        self._files = None
+        self._browser = None
+        self._http_search = None
+        self.is_browser_open = False
+        self.items_in_browser = 0
+        self.is_closed = False
+        with self.shared_resources_lock:
+            NewsAutomation.open_instances += 1
+        for path in (self.temp_path, self.output_path, CACHE_PATH):
+            os.makedirs(path, exist_ok=True)
+        self.news_index = NewsIndex(
+            f'{CACHE_PATH}/seen_news.db' if PERSIST_SEEN_NEWS else None)
+        self.checkpoints = CheckpointStore(
+            f'{CACHE_PATH}/checkpoints', CHECKPOINT_MAX_AGE_HOURS) if CHECKPOINT_MAX_AGE_HOURS else None
+        self.checkpoint_key = None
+        self.page_cards = []
+        self.crawl_state = CrawlState(
+            f'{CACHE_PATH}/crawl_state.db') if INCREMENTAL_CRAWL else None
+
+    @property
+    def files(self) -> 'FileUtils':
+        """File utilities, created on first use."""
+
+        if self._files is None:
+            from file_utils import FileUtils
+
+            self._files = FileUtils()
+            self._files.track_directory(OUTPUT_PATH)
+
+        return self._files
+
+    @property
+    def browser(self) -> 'BrowserUtils':
+        """Browser of the worker, created on first use so Selenium only loads when the browser is needed."""
+
+        if self._browser is None:
+            from browser_utils import BrowserUtils
+
+            self._browser = BrowserUtils()
+
+        return self._browser
+
+    @property
+    def http_search(self) -> 'HttpSearch':
+        """HTTP search backend, created on first use."""
+
+        if self._http_search is None:
+            from http_search import HttpSearch
+
+            self._http_search = HttpSearch(
+                WEBSITE_URL, pool_size=PAGE_FETCH_CONCURRENCY)
+
+        return self._http_search
+
+    @property
+    def downloader(self) -> 'ImageDownloader':
+        """Image downloader used by the enrichment stage, created on first use."""
+
+        if self._downloader is None:
+            from image_downloader import ImageDownloader
+
+            self._downloader = ImageDownloader(
+                ENRICHMENT_WORKERS, cache=self.get_image_cache(), processor=self.get_image_processor(), metrics=self.metrics)
+
+        return self._downloader
+
+    def get_browser_command_count(self) -> int:
+        """Gets the number of WebDriver commands sent so far, without starting the browser."""
+
+        return self._browser.command_count if self._browser else 0
+
+    def get_image_cache(self) -> ImageCache | None:
+        """Gets the image cache shared by all workers, if enabled."""
+
+        if not IMAGE_CACHE_MEGABYTES:
+            return None
+
+        with self.shared_resources_lock:
+            if NewsAutomation.image_cache is None:
+                NewsAutomation.image_cache = ImageCache(
+                    f'{CACHE_PATH}/images', IMAGE_CACHE_MEGABYTES)
+
+        return NewsAutomation.image_cache
+
+    def get_image_processor(self) -> 'ImageProcessor | None':
+        """Gets the image processor shared by all workers, if enabled."""
+
+        if not IMAGE_MAX_DIMENSION:
+            return None
+
+        with self.shared_resources_lock:
+            if NewsAutomation.image_processor is None:
+                from image_processor import ImageProcessor
+
+                NewsAutomation.image_processor = ImageProcessor(
+                    IMAGE_MAX_DIMENSION, IMAGE_JPEG_QUALITY, IMAGE_PROCESSES)
+
+        return NewsAutomation.image_processor
+
+    def setup_extraction(self, item: workitems.Input, output_name: str | None = None, resume: bool = True):
+        """Sets up parameters for news extraction, resuming previous progress of the query unless told otherwise."""
+
+        self.search_phrase = None
+        self.metrics.reset()
+        self.commands_at_start = self.get_browser_command_count()
 
-    def setup_extraction(self, item: workitems.Input):
-        """Sets up parameters for news extraction."""
+        # Validated before anything heavy is loaded, so bad payloads are rejected right away.
+        try:
+            news_data = item.payload["news_data"]
+            search_phrase = news_data["search_phrase"]
+            self.news_category = news_data["news_category"]
+            self.limit_date = Utils.get_inferior_date_interval_from_months(
+                news_data["number_of_months"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise BusinessException(f'Invalid work item payload: {e!r}')
 
-        news_data = item.payload["news_data"]
-        self.search_phrase = news_data["search_phrase"]
-        self.news_category = news_data["news_category"]
-        self.limit_date = Utils.get_inferior_date_interval_from_months(
-            news_data["number_of_months"])
+        self.search_phrase = search_phrase
+        self.output_name = output_name or self.search_phrase
+        self.text_analyzer = TextAnalyzer(
+            [self.search_phrase], MATCH_WHOLE_WORDS)
 
         self.total_pages = 1
-        self.extracted_news = []
+        self.page_state = None
+        self.news_store.clear()
+        self.news_count = 0
+        self.resume_page = 0
+        self.page_cards = []
+        self.news_index.open(self.search_phrase)
+        self.open_result_files()
+        self.open_zip_file()
+        self.open_pipeline()
 
         logger.info(f'Target search phrase: "{self.search_phrase}"')
         logger.info(f'Target news category: "{self.news_category}"')
         logger.info(f'Target limit date: "{self.limit_date}"')
 
+        self.reuses_crawl = not resume
+        self.high_water_mark = None
+        self.previous_cards = []
+
+        if self.checkpoints:
+            self.checkpoint_key = CheckpointStore.get_key(item.payload)
+
+        if not resume:
+            return
+
+        self.load_crawl_state()
+
+        if self.checkpoints:
+            self.restore_checkpoint()
+
     def execute_news_extraction(self):
         """Executes the news extraction process."""
 
-        self.open_website()
-        self.search_for_phrase()
-        self.change_news_category()
-        self.sort_by_most_recent_news()
-        self.get_number_of_pages()
-        self.extract_valid_news()
+        with self.metrics.profile():
+
+            if SEARCH_BACKEND == 'http':
+                try:
+                    with self.metrics.span('http_extraction'):
+                        self.execute_http_news_extraction()
+                    return
+                except BusinessException:
+                    raise
+                except Exception as e:
+                    # Errors of the enrichment and output stages, such as a missing image or a
+                    # failed write, are not failures of the search backend.
+                    self.pipeline.raise_error()
+
+                    logger.warning(
+                        f'HTTP extraction failed, falling back to the browser: {e}')
+                    self.reset_extraction()
+
+            with self.metrics.span('open_website'):
+                self.open_website()
+
+            with self.metrics.span('search_for_phrase'):
+                self.search_for_phrase()
+
+            with self.metrics.span('change_news_category'):
+                self.change_news_category()
+
+            with self.metrics.span('sort_by_most_recent_news'):
+                self.sort_by_most_recent_news()
+
+            with self.metrics.span('get_number_of_pages'):
+                self.get_number_of_pages()
+
+            if self.resume_page:
+                with self.metrics.span('go_to_page'):
+                    self.go_to_page(self.resume_page + 1)
+
+            self.extract_valid_news()
+
+    def execute_http_news_extraction(self):
+        """Executes the news extraction process reading the result pages over HTTP."""
+
+        category_filter = None
+
+        if not self.news_category:
+            logger.warn(f'No news category was inputed.')
+        else:
+            html = self.http_search.fetch_page(
+                self.http_search.build_search_url(self.search_phrase))
+
+            category_filter = self.http_search.parse_page(
+                html).category_filters.get(self.news_category)
+
+            if not category_filter:
+                logger.warn(
+                    f'News category "{self.news_category}" not found.')
+
+        html = self.http_search.fetch_page(self.http_search.build_search_url(
+            self.search_phrase, category_filter))
+
+        page = self.http_search.parse_page(html)
+        self.total_pages = page.total_pages
+
+        logger.info(f'A total of {self.total_pages} pages were found.')
+
+        first_page = self.resume_page + 1
+
+        urls = [self.http_search.build_search_url(self.search_phrase, category_filter, page)
+                for page in range(max(2, first_page), self.total_pages + 1)]
+
+        next_pages = self.http_search.fetch_pages(
+            urls, PAGE_FETCH_CONCURRENCY, self.pipeline.cancelled)
+
+        try:
+            for current_page in range(first_page, self.total_pages + 1):
+
+                logger.info(f'Current page: {current_page}')
+
+                with self.metrics.span('page', page=current_page):
+                    if current_page > 1:
+                        page = self.http_search.parse_page(next(next_pages))
+
+                    has_valid_news = self.extract_news_from_cards(
+                        CardParser.parse(page.results_html))
+
+                if not has_valid_news:
+                    logger.info(
+                        f'Date limit of interest reached, ending extraction...')
+                    break
+
+                if page.next_page_inactive:
+                    logger.info(
+                        f'Next page button is disabled, ending extraction...')
+                    break
+
+                self.save_checkpoint(current_page)
+        except CancelledError:
+            # The pipeline stopped while a page was being fetched.
+            self.pipeline.raise_error()
+            raise
+        finally:
+            next_pages.close()
+
+    def reset_extraction(self):
+        """Discards the news extracted so far."""
+
+        self.cancel_pipeline()
+        self.total_pages = 1
+        self.page_state = None
+        self.news_store.clear()
+        self.news_count = 0
+        self.resume_page = 0
+        self.page_cards = []
+        self.news_index.open(self.search_phrase)
+        self.discard_result_files()
+        self.open_result_files()
+        self.discard_zip_file()
+        self.open_zip_file()
+        self.open_pipeline()
+
+        if self.checkpoints:
+            self.restore_checkpoint()
 
     def create_output_files(self):
         """Creates output files."""
 
-        self.create_excel_file()
-        self.create_images_zip_file()
+        with self.metrics.profile():
+
+            self.merge_previous_news()
+
+            with self.metrics.span('results'):
+                self.create_result_files()
+
+            with self.metrics.span('zip'):
+                self.create_images_zip_file()
+
+        self.news_index.commit()
+
+        if self.crawl_state and not self.reuses_crawl:
+            self.save_crawl_state()
+
+        if self.checkpoints:
+            self.checkpoints.delete(self.checkpoint_key)
+
+    def load_crawl_state(self):
+        """Loads the high-water mark and the result set of the previous run of the query, in incremental mode."""
+
+        if not self.crawl_state:
+            return
+
+        state = self.crawl_state.load(self.search_phrase, self.news_category)
+
+        if state is None:
+            logger.info(f'No previous run of this query, crawling the whole date window...')
+            return
+
+        if state['covered_since'] > self.limit_date:
+            logger.info(
+                f'The previous run covered news since "{state["covered_since"]}" only, crawling the whole date window...')
+            return
+
+        self.high_water_mark = state['high_water_mark']
+        self.previous_cards = [NewsCard(**card) for card in state['cards']]
+
+        logger.info(
+            f'Incremental crawl until the news of {Utils.get_date_from_timestamp(self.high_water_mark)}...')
+
+    def restore_checkpoint(self):
+        """Re-feeds the news accepted before a previous failure, page by page, and sets the page to resume from."""
+
+        restored_cards = 0
+
+        for checkpoint_page in self.checkpoints.load(self.checkpoint_key):
+            cards = [NewsCard(**card) for card in checkpoint_page['cards']]
+
+            self.extract_news_from_cards(cards, restored=True)
+
+            self.resume_page = checkpoint_page['page']
+            restored_cards += len(cards)
+
+        self.page_cards = []
+
+        if not self.resume_page:
+            return
+
+        logger.info(
+            f'Resuming from page {self.resume_page + 1} with {restored_cards} news already accepted...')
+
+        self.metrics.increment('pages_resumed', self.resume_page)
+
+    def save_checkpoint(self, page: int):
+        """Appends the last completed page and the news accepted in it to the checkpoint."""
+
+        if not self.checkpoints:
+            return
+
+        self.checkpoints.append(self.checkpoint_key, page,
+                                [asdict(card) for card in self.page_cards])
+
+        self.page_cards = []
 
     def open_website(self):
-        """Opens the target website."""
+        """Opens the target website, reusing the current browser when possible."""
 
-        self.browser.open_available_browser(
-            f'https://www.latimes.com', maximized=True)
+        self.items_in_browser += 1
+
+        if self.is_browser_open:
+            logger.info(f'Reusing the current browser session...')
+            self.browser.reset_session(WEBSITE_URL)
+            return
+
+        if BROWSER_PROFILE == 'scraping':
+            self.browser.open_scraping_browser(
+                WEBSITE_URL, BROWSER_BLOCKED_RESOURCES, BROWSER_BLOCKED_DOMAINS)
+        else:
+            self.browser.open_available_browser(WEBSITE_URL, maximized=True)
+
+        self.is_browser_open = True
+
+        if METRICS_ENABLED:
+            self.browser.enable_command_counting()
 
     def search_for_phrase(self):
         """Performs a search for a specific phrase."""
@@ -93,7 +478,8 @@ class NewsAutomation:
             self.browser.wait_until_page_contains_element(
                 'css=div[class="search-results-module-filters-selected"][data-showing="true"]')
 
-            self.browser.wait_for_loading('css=div[class="loading-icon"]', 5)
+            self.browser.wait_until_dom_settles(
+                'div[class="loading-icon"]', RESULTS_MODULE_SELECTOR)
 
     def sort_by_most_recent_news(self):
         """Sorts news by most recent."""
@@ -101,34 +487,67 @@ class NewsAutomation:
         self.browser.select_from_list_by_label(
             "css=select[class='select-input']", "Newest")
 
-        self.browser.wait_for_loading('css=div[class="loading-icon"]', 5)
+        self.browser.wait_until_dom_settles(
+            'div[class="loading-icon"]', RESULTS_MODULE_SELECTOR)
 
     def get_number_of_pages(self):
         """Gets the total number of pages containing news."""
 
-        pattern = r'(?<=of\s)[\d.,]+'
+        self.read_current_page()
 
-        match = self.browser.find_pattern_match_in_element(
-            'css=div[class="search-results-module-page-counts"]', pattern, when_visible=False, continue_on_error=True)
+        logger.info(f'A total of {self.total_pages} pages were found.')
 
-        if match:
-            self.total_pages = int(match.group().replace(",", ""))
+    def read_current_page(self):
+        """Reads the cards and the pagination state of the current page in a single browser call."""
 
-        logger.info(f'A total of {self.total_pages} pages were found.')
+        self.page_state = self.browser.get_search_results_page(
+            "ul[class='search-results-module-results-menu']",
+            "div[class='search-results-module-page-counts']",
+            "div[class='search-results-module-next-page']")
+
+        # A results list that never loaded is an error, not a page without news.
+        if not self.page_state['list_found']:
+            raise Exception('Search results list not visible in the page.')
+
+        if self.page_state['total_pages']:
+            self.total_pages = self.page_state['total_pages']
+
+    def go_to_page(self, page: int):
+        """Navigates straight to a results page, keeping the current search, filter and sort order."""
+
+        logger.info(f'Going to page {page}...')
+
+        from http_search import HttpSearch
+
+        self.browser.go_to(HttpSearch.get_page_url(
+            self.browser.get_location(), page))
+
+        self.browser.wait_until_dom_settles(
+            'div[class="loading-icon"]', RESULTS_MODULE_SELECTOR)
+
+        self.read_current_page()
 
     def extract_valid_news(self):
         """Extracts valid news from the current page."""
 
-        for current_page in range(0, self.total_pages):
+        for current_page in range(self.resume_page, self.total_pages):
 
             logger.info(f'Current page: {current_page+1}')
 
-            if not self.extract_news_from_current_page():
+            with self.metrics.span('page', page=current_page + 1):
+                has_valid_news = self.extract_news_from_current_page()
+
+            if not has_valid_news:
                 logger.info(
                     f'Date limit of interest reached, ending extraction...')
                 break
 
-            if not self.go_to_next_page():
+            self.save_checkpoint(current_page + 1)
+
+            with self.metrics.span('go_to_next_page'):
+                has_next_page = self.go_to_next_page()
+
+            if not has_next_page:
                 logger.info(
                     f'Next page button is disabled, ending extraction...')
                 break
@@ -136,49 +555,141 @@ class NewsAutomation:
     def extract_news_from_current_page(self):
         """Extracts news from the current page."""
 
-        img_pattern = r'(?:<img.*?src=\"(.*?)\".*?)?'
-        title_pattern = r'class="promo-title">\s+<a.*?>(.*?)<\/a>.*?'
-        description_pattern = r'class="promo-description".*?>(.*?)<\/p>.*?'
-        timestamp_pattern = r'class=\"promo-timestamp\".*?data-timestamp=\"(.*?)\"'
+        if self.page_state is None:
+            self.read_current_page()
 
-        pattern = img_pattern + title_pattern + description_pattern + timestamp_pattern
+        cards = [NewsCard(**card) for card in self.page_state['cards']]
 
-        matches = self.browser.find_pattern_matches_in_element(
-            "css=ul[class='search-results-module-results-menu']", pattern, when_visible=True, flags=DOTALL)
+        return self.extract_news_from_cards(cards)
 
-        for match in matches:
-            image_url = match.group(1)
-            title = match.group(2)
-            description = match.group(3)
-            news_date = Utils.get_date_from_timestamp(match.group(4))
+    def extract_news_from_cards(self, cards: list[NewsCard], restored: bool = False):
+        """Extracts news from the cards of a search results page, or of a page restored from a checkpoint."""
 
-            if any(news_item['title'] == title and news_item['description'] == description for news_item in self.extracted_news):
-                continue
+        if not restored:
+            self.metrics.increment('pages_visited')
+            self.metrics.increment('cards_parsed', len(cards))
+
+        for card in cards:
+            news_date = Utils.get_date_from_timestamp(card.timestamp)
 
             if news_date < self.limit_date:
                 return False
 
-            file_name = f'{self.search_phrase}_{len(self.extracted_news)}.jpeg'
+            if self.high_water_mark is not None and int(card.timestamp) <= self.high_water_mark:
+                logger.info(
+                    f'Newest news of the previous run reached, merging its results...')
+                return False
 
-            title_counter = Utils.count_pattern_matches_in_text(
-                self.search_phrase, title, IGNORECASE)
+            if self.news_index.contains(card.title, card.description):
+                self.metrics.increment('duplicates_skipped')
+                continue
 
-            description_counter = Utils.count_pattern_matches_in_text(
-                self.search_phrase, description, IGNORECASE)
+            self.news_index.add(card.title, card.description)
+            self.page_cards.append(card)
+            self.add_news(card, news_date)
 
-            contains_monetary = search(
-                r'\$[\d,]+(?:\.\d+)?|\d+\s*(?:dollars?|USD)', f'{title}|{description}', IGNORECASE)
+        return True
 
-            self.extracted_news.append({
-                'title': title,
-                'date': news_date.strftime('%Y-%m-%d'),
-                'description': description,
-                'picture file': self.download_file_from_url(image_url, file_name),
-                'counter': title_counter + description_counter,
-                'contains monetary': bool(contains_monetary)
-            })
+    def add_news(self, card: NewsCard, news_date: datetime):
+        """Adds an accepted news to the pipeline, which analyzes its text and downloads its image."""
 
-        return True
+        file_name = f'{self.search_phrase}_{self.news_count}.jpeg'
+
+        self.news_count += 1
+
+        self.pipeline.put((card, news_date, file_name))
+
+    def enrich_news(self, news: tuple[NewsCard, datetime, str]) -> tuple[NewsRecord, str, bytes | None]:
+        """Analyzes the text of an accepted news and downloads its image, in a thread of the enrichment stage."""
+
+        card, news_date, file_name = news
+
+        analysis = self.text_analyzer.analyze(card.title, card.description)
+
+        record = NewsRecord(
+            image_url=card.image_url,
+            title=card.title,
+            description=card.description,
+            timestamp=card.timestamp,
+            date=sys.intern(news_date.strftime('%Y-%m-%d')),
+            counter=analysis.counts.get(self.search_phrase, 0),
+            contains_monetary=analysis.contains_monetary)
+
+        image = self.get_image(card.image_url) if card.image_url is not None else None
+
+        return record, file_name, image
+
+    def get_image(self, image_url: str) -> bytes | None:
+        """Gets the finished image of a news from the checkpoint, or downloads it and stores it there for a retry."""
+
+        if not self.checkpoints or self.reuses_crawl:
+            return self.downloader.download(image_url)
+
+        image = self.checkpoints.load_image(self.checkpoint_key, image_url)
+
+        if image is not None:
+            self.metrics.increment('images_restored')
+            return image
+
+        image = self.downloader.download(image_url)
+        self.checkpoints.save_image(self.checkpoint_key, image_url, image)
+
+        return image
+
+    def reuse_extracted_news(self, cards: list[NewsCard]):
+        """Extracts the news of the work item from the cards accepted by a wider crawl of the same query."""
+
+        for card in cards:
+            news_date = Utils.get_date_from_timestamp(card.timestamp)
+
+            if news_date < self.limit_date:
+                continue
+
+            self.add_news(card, news_date)
+
+        logger.info(
+            f'{self.news_count} news reused from the crawl of the same query.')
+
+    def get_extracted_cards(self) -> list[NewsCard]:
+        """Gets the cards of the news extracted for the current work item."""
+
+        return [record.get_card() for record in self.news_store]
+
+    def merge_previous_news(self):
+        """Adds the news of the previous run of the same query that are still within the date window."""
+
+        if not self.previous_cards:
+            return
+
+        # The rows are still being written, so the news accepted so far are taken from the index.
+        accepted_keys = set(self.news_index.pending_keys)
+
+        merged = 0
+
+        for card in self.previous_cards:
+            news_date = Utils.get_date_from_timestamp(card.timestamp)
+
+            if news_date < self.limit_date or NewsIndex.get_key(card.title, card.description) in accepted_keys:
+                continue
+
+            self.add_news(card, news_date)
+            merged += 1
+
+        logger.info(f'{merged} news merged from the previous run.')
+
+        self.metrics.increment('previous_news_merged', merged)
+
+    def save_crawl_state(self):
+        """Stores the high-water mark and the result set of the query for the next incremental run."""
+
+        high_water_mark = max((int(record.timestamp) for record in self.news_store),
+                              default=self.high_water_mark)
+
+        if high_water_mark is None:
+            return
+
+        self.crawl_state.save(self.search_phrase, self.news_category, high_water_mark, self.limit_date,
+                              [asdict(record.get_card()) for record in self.news_store])
 
     def go_to_next_page(self):
         """Navigates to the next page of news."""
@@ -187,84 +698,275 @@ class NewsAutomation:
 
         next_page_locator = "css=div[class='search-results-module-next-page']"
 
-        if self.browser.element_exists(next_page_locator, 10) is False:
-            return False
-
-        is_inactive = self.browser.find_pattern_match_in_element(
-            next_page_locator, r'data-inactive')
+        page, self.page_state = self.page_state, None
 
-        if is_inactive:
+        if not page['next_page_exists'] or page['next_page_inactive']:
             return False
 
         self.browser.scroll_element_into_view(
             next_page_locator)
 
+        self.browser.wait_until_dom_settles(root_selector=RESULTS_MODULE_SELECTOR)
+
         self.browser.remove_element_if_possible(
-            "css=modality-custom-element[name='metering-bottompanel']", timeout=10)
+            "css=modality-custom-element[name='metering-bottompanel']")
 
         self.browser.click_element(next_page_locator)
 
+        self.browser.wait_until_dom_settles(
+            'div[class="loading-icon"]', RESULTS_MODULE_SELECTOR)
+
         return True
 
-    def create_excel_file(self):
-        """Creates an Excel file with extracted news."""
+    def open_result_files(self):
+        """Opens the result files, one per output format, that receive the extracted news as they are accepted."""
 
-        logger.info(f'Creating Excel file...')
+        self.result_writers = []
 
-        excel_path = f'{TEMP_PATH}/{self.search_phrase}.xlsx'
+        # Added one by one, so the files opened before a failure are still closed with the others.
+        for output_format in OUTPUT_FORMATS:
+            self.result_writers.append(self.files.open_result_stream(
+                f'{self.temp_path}/{self.output_name}.{output_format}', output_format, NEWS_COLUMNS))
 
-        self.files.create_excel_file_from_json(self.extracted_news, excel_path)
+    def discard_result_files(self):
+        """Closes the result files being written, if any, so they can be deleted."""
 
-    def create_images_zip_file(self):
-        """Creates a ZIP file containing news images."""
+        for writer in self.result_writers:
+            try:
+                writer.close()
+            except Exception as e:
+                logger.warning(f'Unable to close {writer.path}: {e}')
 
-        logger.info(f'Creating Zip file...')
+        self.result_writers = []
 
-        zip_path = f'{OUTPUT_PATH}/{self.search_phrase}.zip'
+    def open_pipeline(self):
+        """Starts the stages that enrich the accepted news and write them to the result and ZIP files while extraction goes on."""
 
-        files_to_zip = [
-            f"{TEMP_PATH}/{data['picture file']}" for data in self.extracted_news if data['picture file'] != '-']
+        # Created before the enrichment threads share it, so they never race to create it.
+        self.downloader
 
-        files_to_zip.append(f'{TEMP_PATH}/{self.search_phrase}.xlsx')
+        self.pipeline = Pipeline(self.enrich_news, self.write_row,
+                                 ENRICHMENT_WORKERS, PIPELINE_QUEUE_SIZE, name='news')
 
-        self.files.create_zip_from_files(zip_path, files_to_zip)
+    def write_row(self, row: tuple[NewsRecord, str, bytes | None]):
+        """Stores an enriched news and writes it to the result files, after adding its image to the ZIP file."""
 
-        if self.files.count_files_in_directory(OUTPUT_PATH) > 50:
+        record, file_name, image = row
+        picture_file = '-'
 
-            self.files.delete_file(zip_path)
+        self.news_store.append(record)
 
+        # The row is reserved before its image, so images never take the room the result files need.
+        if not self.zip_writer.reserve(self.estimate_row_bytes(record.get_row(file_name))):
             raise BusinessException(
-                f'The total number of files exceeds the maximum allowed limit.')
+                f'The size of {self.output_name}.zip exceeds the maximum allowed limit in megabytes.')
+
+        if image is not None:
+            if self.add_image_to_zip_file(file_name, image):
+                picture_file = file_name
+
+        news_row = record.get_row(picture_file)
+
+        for writer in self.result_writers:
+            writer.append(news_row)
+
+    def estimate_row_bytes(self, news_row: dict) -> int:
+        """Estimates the bytes a row adds to the result files, taking its JSON size for every output format."""
+
+        return len(json.dumps(news_row, ensure_ascii=False).encode('utf-8')) * len(self.result_writers)
+
+    def create_result_files(self):
+        """Finishes the result files with extracted news."""
+
+        logger.info(
+            f'Waiting for {self.pipeline.get_pending_count()} pending news rows...')
+
+        self.pipeline.close()
+        self.pipeline = None
+
+        for writer in self.result_writers:
+            logger.info(f'Creating {os.path.basename(writer.path)}...')
+            writer.close()
+
+        self.result_files = [writer.path for writer in self.result_writers]
+        self.result_writers = []
+
+    def open_zip_file(self):
+        """Opens the ZIP file that receives the news images in the temp folder, failing early if the output budget is exhausted."""
+
+        zip_path = f'{self.output_path}/{self.output_name}.zip'
 
-        if self.files.get_megabytes_size_of_directory(OUTPUT_PATH) > 20:
+        with self.output_lock:
 
-            self.files.delete_file(zip_path)
+            # An artifact with the same name is only replaced once the new one is complete.
+            replaced_bytes = os.path.getsize(zip_path) if os.path.isfile(zip_path) else 0
 
+            if not replaced_bytes and self.files.count_files_in_directory(OUTPUT_PATH) >= MAX_OUTPUT_FILES:
+                raise BusinessException(
+                    f'The total number of files exceeds the maximum allowed limit.')
+
+            available_bytes = (MAX_OUTPUT_MEGABYTES - self.files.get_megabytes_size_of_directory(
+                OUTPUT_PATH)) * 1024 * 1024 + replaced_bytes
+
+            self.zip_writer = self.files.open_zip_stream(
+                f'{self.temp_path}/{self.output_name}.zip.part', int(available_bytes))
+
+        # Room for the result files, which are only added once every image is in.
+        for writer in self.result_writers:
+            if not self.zip_writer.reserve(self.zip_writer.get_entry_size(os.path.basename(writer.path), RESULT_FILE_BASE_BYTES)):
+                raise BusinessException(
+                    f'The size of {self.output_name}.zip exceeds the maximum allowed limit in megabytes.')
+
+    def add_image_to_zip_file(self, file_name: str, data: bytes) -> bool:
+        """Adds a downloaded image to the ZIP file, applying the output budget policy when it does not fit."""
+
+        if self.zip_writer.write_bytes(file_name, data):
+            return True
+
+        if OUTPUT_BUDGET_POLICY != 'degrade':
             raise BusinessException(
-                f'The size of {self.search_phrase}.zip exceeds the maximum allowed limit in megabytes.')
+                f'The size of {self.output_name}.zip exceeds the maximum allowed limit in megabytes.')
+
+        logger.warning(
+            f'Image "{file_name}" left out of the Zip file to stay within the size limit.')
 
-    def download_file_from_url(self, url: str | None, file_name: str):
-        """Downloads a file from a URL."""
+        return False
 
-        if url is None:
-            return '-'
+    def discard_zip_file(self):
+        """Deletes the partial ZIP file being written, if any, leaving the one in the output folder untouched."""
 
-        self.http.download(
-            url=url,
-            target_file=f'{TEMP_PATH}/{file_name}',
-            overwrite=True)
+        if self.zip_writer is None:
+            return
 
-        return file_name
+        self.zip_writer.discard()
+        self.zip_writer = None
 
-    def close_resources(self):
-        """Closes resources after extraction."""
+    def create_images_zip_file(self):
+        """Finishes the ZIP file containing news images and moves it to the output folder if it fits in the budget."""
 
-        logger.info(f'Closing website...')
+        logger.info(f'Creating Zip file...')
+
+        self.zip_writer.release_reserved()
+
+        for result_file in self.result_files:
+            if not self.zip_writer.write_file(result_file):
+                raise BusinessException(
+                    f'The size of {self.output_name}.zip exceeds the maximum allowed limit in megabytes.')
+
+        self.zip_writer.close()
+
+        zip_path = f'{self.output_path}/{self.output_name}.zip'
+
+        with self.output_lock:
+
+            replaced_bytes = os.path.getsize(zip_path) if os.path.isfile(zip_path) else 0
+            added_files = 0 if os.path.isfile(zip_path) else 1
+            added_megabytes = (os.path.getsize(self.zip_writer.path) - replaced_bytes) / (1024 * 1024)
+
+            if self.files.count_files_in_directory(OUTPUT_PATH) + added_files > MAX_OUTPUT_FILES:
+                raise BusinessException(
+                    f'The total number of files exceeds the maximum allowed limit.')
+
+            if self.files.get_megabytes_size_of_directory(OUTPUT_PATH) + added_megabytes > MAX_OUTPUT_MEGABYTES:
+                raise BusinessException(
+                    f'The size of {self.output_name}.zip exceeds the maximum allowed limit in megabytes.')
+
+            os.replace(self.zip_writer.path, zip_path)
+
+            self.files.record_file(zip_path)
+
+        self.zip_writer = None
+
+    def cancel_pipeline(self):
+        """Stops every stage of the pipeline, dropping the pending news and waiting for the running ones."""
+
+        if self.pipeline is None:
+            return
+
+        self.pipeline.cancel()
+        self.pipeline = None
+
+    def export_metrics(self):
+        """Writes the metrics of the current work item to the metrics folder."""
+
+        self.metrics.increment(
+            'webdriver_commands', self.get_browser_command_count() - self.commands_at_start)
+
+        os.makedirs(self.metrics_path, exist_ok=True)
+
+        self.metrics.export_json(
+            f'{self.metrics_path}/{self.output_name}_metrics.json')
+
+        if PROFILE_ENABLED:
+            self.metrics.export_profile(
+                f'{self.metrics_path}/{self.output_name}.prof')
+
+        if METRICS_PROMETHEUS_PATH:
+            self.metrics.export_prometheus(
+                METRICS_PROMETHEUS_PATH, {'search_phrase': self.search_phrase})
+
+    def close_resources(self, recycle_browser: bool = False):
+        """Closes resources after extraction, keeping the browser warm unless it must be recycled."""
+
+        if self.metrics.enabled and self.search_phrase:
+            try:
+                self.export_metrics()
+            except Exception as e:
+                logger.warning(f'Unable to export the metrics: {e}')
 
         self.total_pages = 1
 
-        self.extracted_news = []
+        self.cancel_pipeline()
+
+        self.news_store.clear()
+
+        self.discard_result_files()
+
+        self.discard_zip_file()
+
+        if recycle_browser or not REUSE_BROWSER or self.items_in_browser >= BROWSER_RECYCLE_ITEMS:
+            self.close_browser()
+
+        if self._files:
+            self.files.delete_files_from_folder(self.temp_path)
+
+    def close_browser(self):
+        """Closes the browser, ignoring errors from sessions that already crashed."""
+
+        if not self.is_browser_open:
+            return
+
+        logger.info(f'Closing website...')
+
+        try:
+            self.browser.close_browser()
+        except Exception as e:
+            logger.warning(f'Unable to close the browser: {e}')
+
+        self.is_browser_open = False
+        self.items_in_browser = 0
+
+    def close(self):
+        """Closes the browser and releases the HTTP sessions and thread pools, and the shared image processor after the last worker."""
+
+        if self.is_closed:
+            return
+
+        self.is_closed = True
+
+        self.close_browser()
+
+        if self._downloader:
+            self._downloader.close()
+            self._downloader = None
+
+        if self._http_search:
+            self._http_search.close()
+            self._http_search = None
 
-        self.browser.close_browser()
+        with self.shared_resources_lock:
+            NewsAutomation.open_instances -= 1
 
-        self.files.delete_files_from_folder(TEMP_PATH)
+            if not NewsAutomation.open_instances and NewsAutomation.image_processor:
+                NewsAutomation.image_processor.close()
+                NewsAutomation.image_processor = None
@@ -0,0 +1,101 @@
+import re
+import sqlite3
+import hashlib
+
+
+class NewsIndex:
+    """
+    Hash index of the news already extracted, used to skip duplicated articles in O(1).
+
+    Each article is keyed by a hash of its normalized title and description. Optionally the
+    keys are persisted in a SQLite database, so later runs of the same search phrase skip the
+    articles extracted before.
+    """
+
+    def __init__(self, database_path: str | None = None):
+        """
+        Initializes the index, connecting to the database when one is given.
+
+        Args:
+            database_path (str | None, optional): Path of the SQLite database. Defaults to None (in-memory only).
+        """
+        self.scope = None
+        self.keys = set()
+        self.pending_keys = []
+        self.connection = None
+
+        if database_path:
+            self.connection = sqlite3.connect(database_path, timeout=30)
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS seen_news (scope TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (scope, key))')
+            self.connection.commit()
+
+    def get_key(title: str, description: str) -> str:
+        """
+        Build the key of an article from its normalized title and description.
+
+        Args:
+            title (str): Title of the article.
+            description (str): Description of the article.
+
+        Returns:
+            str: Hexadecimal hash identifying the article.
+        """
+        normalized = '\x1f'.join(
+            re.sub(r'\s+', ' ', text).strip().casefold() for text in (title, description))
+        return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+    def open(self, scope: str):
+        """
+        Starts a new extraction, loading the keys persisted for the given scope.
+
+        Args:
+            scope (str): Scope of the keys, usually the search phrase.
+        """
+        self.scope = scope
+        self.keys = set()
+        self.pending_keys = []
+
+        if self.connection:
+            rows = self.connection.execute(
+                'SELECT key FROM seen_news WHERE scope = ?', (scope,))
+            self.keys.update(key for key, in rows)
+
+    def contains(self, title: str, description: str) -> bool:
+        """
+        Check whether an article was already seen.
+
+        Args:
+            title (str): Title of the article.
+            description (str): Description of the article.
+
+        Returns:
+            bool: True if the article is in the index, False otherwise.
+        """
+        return NewsIndex.get_key(title, description) in self.keys
+
+    def add(self, title: str, description: str):
+        """
+        Add an article to the index. It is only persisted after calling commit.
+
+        Args:
+            title (str): Title of the article.
+            description (str): Description of the article.
+        """
+        key = NewsIndex.get_key(title, description)
+
+        if key not in self.keys:
+            self.keys.add(key)
+            self.pending_keys.append(key)
+
+    def commit(self):
+        """
+        Persists the keys added since the index was opened.
+        """
+        if self.connection and self.pending_keys:
+            self.connection.executemany(
+                'INSERT OR IGNORE INTO seen_news (scope, key) VALUES (?, ?)',
+                [(self.scope, key) for key in self.pending_keys])
+            self.connection.commit()
+
+        self.pending_keys = []
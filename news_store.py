@@ -0,0 +1,148 @@
+import os
+import sys
+import json
+from typing import Iterator
+from dataclasses import dataclass, astuple
+from card_parser import NewsCard
+
+# Columns of the result files and their types, in the order of NewsRecord.get_row.
+NEWS_COLUMNS = {
+    'title': str,
+    'date': str,
+    'description': str,
+    'picture file': str,
+    'counter': int,
+    'contains monetary': bool
+}
+
+
+@dataclass(frozen=True, slots=True)
+class NewsRecord:
+    """
+    News accepted by an extraction, with the card it came from and its analysis.
+    """
+
+    image_url: str | None
+    title: str
+    description: str
+    timestamp: str
+    date: str
+    counter: int
+    contains_monetary: bool
+
+    def get_card(self) -> NewsCard:
+        """
+        Get the card the news was extracted from.
+
+        Returns:
+            NewsCard: Card of the news.
+        """
+        return NewsCard(self.image_url, self.title, self.description, self.timestamp)
+
+    def get_row(self, picture_file: str) -> dict:
+        """
+        Get the row of the news in the output files.
+
+        Args:
+            picture_file (str): Name of the news image in the ZIP file, or '-' if there is none.
+
+        Returns:
+            dict: Row keyed by column name, with the columns of NEWS_COLUMNS.
+        """
+        return {
+            'title': self.title,
+            'date': self.date,
+            'description': self.description,
+            'picture file': picture_file,
+            'counter': self.counter,
+            'contains monetary': self.contains_monetary
+        }
+
+
+class NewsStore:
+    """
+    Append-only store of the news accepted by an extraction, with bounded memory usage.
+
+    Records are kept in memory until their number exceeds the limit, then they are spilled to
+    a JSON Lines file. Iterating the store reads the spilled records back before the ones in
+    memory, in insertion order.
+    """
+
+    def __init__(self, spill_path: str, max_rows_in_memory: int = 1000):
+        """
+        Initializes an empty store.
+
+        Args:
+            spill_path (str): Path of the file receiving the spilled records.
+            max_rows_in_memory (int, optional): Number of records kept in memory before spilling, 0 never spills. Defaults to 1000.
+        """
+        self.spill_path = spill_path
+        self.max_rows_in_memory = max_rows_in_memory
+        self.records = []
+        self.spilled_count = 0
+        self.spill_file = None
+
+    def __len__(self) -> int:
+        return self.spilled_count + len(self.records)
+
+    def __iter__(self) -> Iterator[NewsRecord]:
+        if self.spill_file:
+            self.spill_file.flush()
+
+            with open(self.spill_path, encoding='utf-8') as file:
+                for line in file:
+                    yield NewsStore.load_record(line)
+
+        yield from list(self.records)
+
+    def load_record(line: str) -> NewsRecord:
+        """
+        Rebuild a spilled record.
+
+        Args:
+            line (str): JSON line of the record.
+
+        Returns:
+            NewsRecord: The record, with its date string interned.
+        """
+        image_url, title, description, timestamp, date, counter, contains_monetary = json.loads(line)
+        return NewsRecord(image_url, title, description, timestamp, sys.intern(date), counter, contains_monetary)
+
+    def append(self, record: NewsRecord):
+        """
+        Add a record, spilling the records in memory once they exceed the limit.
+
+        Args:
+            record (NewsRecord): Record to add.
+        """
+        self.records.append(record)
+
+        if self.max_rows_in_memory and len(self.records) > self.max_rows_in_memory:
+            self.spill()
+
+    def spill(self):
+        """
+        Writes the records in memory to the spill file and releases them.
+        """
+        if self.spill_file is None:
+            self.spill_file = open(self.spill_path, 'w', encoding='utf-8')
+
+        for record in self.records:
+            self.spill_file.write(json.dumps(astuple(record)) + '\n')
+
+        self.spilled_count += len(self.records)
+        self.records = []
+
+    def clear(self):
+        """
+        Discards every record, deleting the spill file.
+        """
+        self.records = []
+        self.spilled_count = 0
+
+        if self.spill_file:
+            self.spill_file.close()
+            self.spill_file = None
+
+            if os.path.exists(self.spill_path):
+                os.remove(self.spill_path)
@@ -0,0 +1,231 @@
+import queue
+import threading
+from typing import Any, Callable
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+
+
+class EnrichmentStage:
+    """
+    Middle stage of a pipeline: transforms items in a pool of worker threads, through a bounded queue.
+
+    Each put returns the future of the transformed item, so the next stage can consume the results
+    in the order the items were put while up to `workers` of them are transformed at the same time.
+    The producer blocks once `capacity` items are waiting or running. Items not started yet are
+    skipped once the cancellation event is set.
+    """
+
+    def __init__(self, handler: Callable[[Any], Any], workers: int, capacity: int, cancelled: threading.Event, name: str = 'enrichment'):
+        """
+        Starts the thread pool of the stage.
+
+        Args:
+            handler (Callable[[Any], Any]): Function called with each item, returning the transformed item.
+            workers (int): Number of items transformed at the same time.
+            capacity (int): Maximum number of items waiting or running.
+            cancelled (threading.Event): Cancellation event shared by the stages of the pipeline.
+            name (str, optional): Prefix of the thread names. Defaults to 'enrichment'.
+        """
+        self.handler = handler
+        self.cancelled = cancelled
+        self.slots = threading.Semaphore(max(1, capacity))
+        self.executor = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix=name)
+
+    def run(self, item: Any) -> Any:
+        """
+        Transforms an item, unless the pipeline was cancelled, and frees its slot.
+        """
+        try:
+            if self.cancelled.is_set():
+                raise CancelledError()
+
+            return self.handler(item)
+        finally:
+            self.slots.release()
+
+    def put(self, item: Any) -> Future:
+        """
+        Add an item to the stage, waiting while the stage is full.
+
+        Args:
+            item (Any): Item to transform.
+
+        Returns:
+            Future: Future resolved with the transformed item.
+        """
+        while not self.slots.acquire(timeout=0.1):
+            if self.cancelled.is_set():
+                raise CancelledError()
+
+        return self.executor.submit(self.run, item)
+
+    def close(self):
+        """
+        Waits for the running items, dropping the ones not started yet if the pipeline was cancelled.
+        """
+        self.executor.shutdown(wait=True, cancel_futures=self.cancelled.is_set())
+
+
+class SinkStage:
+    """
+    Last stage of a pipeline: consumes items in order in a background thread, through a bounded queue.
+
+    The producer blocks once the queue is full, so it never gets more than `capacity` items ahead
+    of the sink. An error raised by the handler stops the stage, sets the cancellation event and is
+    raised again in the producer on its next put, or when the stage is closed.
+    """
+
+    END = object()
+
+    def __init__(self, handler: Callable[[Any], None], capacity: int, name: str = 'sink', cancelled: threading.Event | None = None):
+        """
+        Starts the thread of the stage.
+
+        Args:
+            handler (Callable[[Any], None]): Function called with each item, in order.
+            capacity (int): Maximum number of items waiting in the queue.
+            name (str, optional): Name of the thread. Defaults to 'sink'.
+            cancelled (threading.Event | None, optional): Cancellation event shared by the stages of the pipeline. Defaults to a new one.
+        """
+        self.handler = handler
+        self.queue = queue.Queue(maxsize=max(1, capacity))
+        self.error = None
+        self.cancelled = cancelled or threading.Event()
+        self.discarded = []
+        self.thread = threading.Thread(target=self.run, name=name, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        """
+        Handles the items of the queue until the end marker, discarding them after an error or a cancellation.
+        """
+        while (item := self.queue.get()) is not SinkStage.END:
+            if self.error is not None or self.cancelled.is_set():
+                self.discarded.append(item)
+                continue
+
+            try:
+                self.handler(item)
+            except BaseException as e:
+                self.error = e
+                self.cancelled.set()
+                self.discarded.append(item)
+
+    def put(self, item: Any):
+        """
+        Add an item to the stage, waiting while the queue is full.
+
+        Args:
+            item (Any): Item to handle.
+        """
+        while True:
+            self.raise_error()
+
+            try:
+                self.queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def raise_error(self):
+        """
+        Raises the error of the handler, if any.
+        """
+        if self.error is not None:
+            raise self.error
+
+    def close(self):
+        """
+        Waits until every item is handled, raising the error of the handler, if any.
+        """
+        self.queue.put(SinkStage.END)
+        self.thread.join()
+        self.raise_error()
+
+    def cancel(self) -> list:
+        """
+        Stops the stage without handling the items still waiting.
+
+        Returns:
+            list: Items that were not handled.
+        """
+        self.cancelled.set()
+        self.queue.put(SinkStage.END)
+        self.thread.join()
+        return self.discarded
+
+
+class Pipeline:
+    """
+    Producer, enrichment and sink stages sharing one cancellation event.
+
+    The producer puts items into the enrichment stage, which transforms them concurrently, and the
+    sink stage handles the transformed items in the order they were put. Both stages are bounded,
+    so the producer pauses when either is full. An error in any stage, or a call to cancel, sets
+    the event: both stages stop, and the producer can pass the event to its own background work,
+    such as page prefetches, to stop it too.
+    """
+
+    def __init__(self, enrich: Callable[[Any], Any], sink: Callable[[Any], None], workers: int, capacity: int, name: str = 'pipeline'):
+        """
+        Starts the stages of the pipeline.
+
+        Args:
+            enrich (Callable[[Any], Any]): Function transforming each item, called concurrently.
+            sink (Callable[[Any], None]): Function handling each transformed item, called in order.
+            workers (int): Number of items transformed at the same time.
+            capacity (int): Maximum number of items waiting in each stage.
+            name (str, optional): Prefix of the thread names. Defaults to 'pipeline'.
+        """
+        self.cancelled = threading.Event()
+        self.enrichment = EnrichmentStage(
+            enrich, workers, capacity, self.cancelled, f'{name}-enrichment')
+        self.sink = SinkStage(lambda future: sink(future.result()),
+                              capacity, f'{name}-sink', self.cancelled)
+
+    def put(self, item: Any):
+        """
+        Add an item to the pipeline, waiting while a stage is full.
+
+        Args:
+            item (Any): Item to enrich and handle.
+        """
+        try:
+            future = self.enrichment.put(item)
+        except CancelledError:
+            self.raise_error()
+            raise
+
+        self.sink.put(future)
+
+    def raise_error(self):
+        """
+        Raises the error that stopped the pipeline, if any.
+        """
+        self.sink.raise_error()
+
+    def get_pending_count(self) -> int:
+        """
+        Get the number of items waiting for the sink.
+
+        Returns:
+            int: Number of items in the queue of the sink.
+        """
+        return self.sink.queue.qsize()
+
+    def close(self):
+        """
+        Waits until every item is handled, raising the error that stopped the pipeline, if any.
+        """
+        try:
+            self.sink.close()
+        finally:
+            self.enrichment.close()
+
+    def cancel(self):
+        """
+        Stops every stage, dropping the items not handled yet and waiting for the running ones.
+        """
+        self.cancelled.set()
+        self.sink.cancel()
+        self.enrichment.close()
@@ -0,0 +1,84 @@
+import re
+from dataclasses import dataclass
+
+MONETARY_PATTERN = r'\$[\d,]+(?:\.\d+)?|\d+\s*(?:dollars?|USD)'
+
+
+@dataclass(frozen=True)
+class TextAnalysis:
+    """
+    Result of the analysis of a news text.
+    """
+
+    counts: dict[str, int]
+    contains_monetary: bool
+
+
+class TextAnalyzer:
+    """
+    Counts phrases and detects monetary amounts in a text with a single compiled pattern.
+
+    All phrases are escaped and joined, longest first, into one case-insensitive alternation
+    together with a zero-width lookahead for monetary amounts, so the text is scanned once no
+    matter how many phrases are searched. Phrase matches do not overlap: at each position the
+    longest phrase wins, as with a leftmost-longest Aho-Corasick scan.
+    """
+
+    def __init__(self, phrases: list[str], whole_words: bool = False):
+        """
+        Compiles the pattern of the given phrases.
+
+        Args:
+            phrases (list[str]): Phrases to count. Empty and case-insensitive duplicate phrases are ignored.
+            whole_words (bool, optional): Whether phrases only count when not surrounded by word characters. Defaults to False.
+        """
+        unique_phrases = {}
+
+        for phrase in phrases:
+            if phrase:
+                unique_phrases.setdefault(phrase.casefold(), phrase)
+
+        self.phrases = list(unique_phrases.values())
+        self.monetary_pattern = re.compile(MONETARY_PATTERN, re.IGNORECASE)
+
+        alternatives = []
+
+        for index, phrase in sorted(enumerate(self.phrases), key=lambda entry: -len(entry[1])):
+            phrase_pattern = re.escape(phrase)
+            if whole_words:
+                phrase_pattern = rf'(?<!\w){phrase_pattern}(?!\w)'
+            alternatives.append(f'(?P<phrase_{index}>{phrase_pattern})')
+
+        alternatives.append(f'(?=(?P<monetary>{MONETARY_PATTERN}))')
+
+        self.pattern = re.compile('|'.join(alternatives), re.IGNORECASE)
+
+    def analyze(self, *texts: str) -> TextAnalysis:
+        """
+        Count the phrases and look for monetary amounts in one or more texts.
+
+        Args:
+            *texts (str): Texts to analyze, such as the title and the description of a news.
+
+        Returns:
+            TextAnalysis: Number of matches of each phrase and whether any monetary amount was found.
+        """
+        text = '|'.join(texts)
+        counts = [0] * len(self.phrases)
+        contains_monetary = False
+
+        for match in self.pattern.finditer(text):
+            group = match.lastgroup
+
+            if group == 'monetary':
+                contains_monetary = True
+                continue
+
+            counts[int(group[7:])] += 1
+
+            # A phrase match hides the monetary lookahead at the positions it covers.
+            if not contains_monetary:
+                contains_monetary = any(self.monetary_pattern.match(text, position)
+                                        for position in range(match.start(), match.end()))
+
+        return TextAnalysis(dict(zip(self.phrases, counts)), contains_monetary)
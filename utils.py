@@ -1,6 +1,4 @@
-import re
 from datetime import datetime, timedelta
-from typing import Any
 
 
 class Utils():
@@ -43,17 +41,3 @@ class Utils():
             datetime: Datetime object representing the timestamp.
         """
         return datetime.fromtimestamp(int(timestamp) / 1000)
-
-    def count_pattern_matches_in_text(pattern: Any, text: str, flags=0):
-        """
-        Count the occurrences of a pattern in a text using regular expressions.
-
-        Args:
-            pattern (Any): Regular expression pattern to search for.
-            text (str): Text to search within.
-            flags (int): Optional flags to modify regex behavior (default is 0).
-
-        Returns:
-            int: Number of matches found.
-        """
-        return len(re.findall(pattern, text, flags=flags))
@@ -0,0 +1,112 @@
+import os
+import logging
+import threading
+from importlib import metadata
+from robocorp import workitems
+from config import ALLOW_CONCURRENT_RESERVATIONS
+
+logger = logging.getLogger(__name__)
+
+# Versions of robocorp-workitems whose internals WorkItemQueue was verified against.
+TESTED_WORKITEMS_VERSIONS = ('1.4.',)
+
+
+class WorkItemQueue:
+    """
+    Thread-safe access to the input work item queue for concurrent workers.
+
+    robocorp.workitems only allows a single reserved input per task context, so additional
+    inputs are reserved straight from the adapter of that context, which is not a public API.
+    This is only done when can_reserve_concurrently allows it. Each worker releases the items
+    it reserved through the shared lock.
+    """
+
+    def can_reserve_concurrently() -> bool:
+        """
+        Check whether several input work items can be reserved at the same time in this run.
+
+        Requires a tested version of robocorp-workitems, since the adapter of the task context is
+        private. In Control Room, where one reserved item per step run is the documented contract,
+        it also requires NEWS_ALLOW_CONCURRENT_RESERVATIONS; parallel step runs are the supported
+        way to process items concurrently there.
+
+        Returns:
+            bool: True if the worker pool and coalescing can be used, False otherwise.
+        """
+        try:
+            version = metadata.version('robocorp-workitems')
+        except metadata.PackageNotFoundError:
+            version = None
+
+        if version is None or not version.startswith(TESTED_WORKITEMS_VERSIONS):
+            logger.warning(
+                f'robocorp-workitems {version} was not tested with concurrent reservations, processing one work item at a time.')
+            return False
+
+        if os.getenv('RC_WORKSPACE_ID') and not ALLOW_CONCURRENT_RESERVATIONS:
+            logger.warning(
+                'Control Room allows one reserved work item per step run, processing one work item at a time. '
+                'Use parallel step runs, or set NEWS_ALLOW_CONCURRENT_RESERVATIONS to reserve several.')
+            return False
+
+        return True
+
+    def __init__(self):
+        """
+        Takes the input reserved by the task context and the adapter it was loaded with.
+        """
+        self.lock = threading.Lock()
+
+        try:
+            self.first_input = workitems.inputs.current
+        except workitems.EmptyQueue:
+            self.first_input = None
+
+        # Sharing the adapter of the task context guarantees no item is reserved twice.
+        self.adapter = getattr(self.first_input, '_adapter', None)
+
+        if self.first_input is not None and self.adapter is None:
+            raise RuntimeError(
+                'The work item adapter is not available in this version of robocorp-workitems.')
+
+    def reserve(self) -> workitems.Input | None:
+        """
+        Reserves the next input work item of the queue.
+
+        Returns:
+            (workitems.Input | None): The reserved work item, or None if the queue is empty.
+        """
+        with self.lock:
+            if self.first_input is not None:
+                item, self.first_input = self.first_input, None
+                return item
+
+            if self.adapter is None:
+                return None
+
+            try:
+                item_id = self.adapter.reserve_input()
+            except workitems.EmptyQueue:
+                return None
+
+            item = workitems.Input(adapter=self.adapter, item_id=item_id)
+            item.load()
+
+            return item
+
+    def reserve_all(self) -> list[workitems.Input]:
+        """
+        Reserves every input work item left in the queue.
+
+        Holds the whole queue for the length of the run, so it is only used for coalescing once
+        can_reserve_concurrently allows it.
+
+        Returns:
+            list[workitems.Input]: The reserved work items, in queue order.
+        """
+        items = []
+
+        while (item := self.reserve()) is not None:
+            items.append(item)
+
+        return items